@@ -1,15 +1,40 @@
 """The MinderGas integration."""
+import asyncio
+import hashlib
 import logging
 from datetime import datetime, timedelta
-from random import randint
-from typing import Final
+from random import Random
+from typing import Any, Final, Optional
 
+import voluptuous as vol
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.event import async_track_time_change
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import (
+    Event,
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ConfigEntryError, ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later, async_track_time_change
+from homeassistant.helpers.json import json_bytes_sorted
+from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.util import dt as dt_util
 
-from .api import MinderGasAPI
+from .api import (
+    MinderGasAPI,
+    MinderGasAuthError,
+    MinderGasError,
+    MinderGasPaymentRequiredError,
+)
 from .const import (
+    ADAPTIVE_REFRESH_MIN_SAMPLES,
+    ADAPTIVE_REFRESH_RETRIES,
+    ADAPTIVE_REFRESH_RETRY,
     CONF_API_KEY,
     CONF_POST_METER_READING,
     CONF_POST_TIME,
@@ -17,9 +42,42 @@ from .const import (
     CONF_UPDATE_STATS,
     CONF_UPDATE_TIME,
     CONF_RANDOMIZE_POST_TIME,
+    CONF_REFRESH_COOLDOWN,
+    CONF_INTRADAY_READINGS,
+    CONF_INTRADAY_INTERVAL,
+    CONF_DAILY_REQUEST_BUDGET,
+    DEFAULT_REFRESH_COOLDOWN,
+    DEFAULT_INTRADAY_INTERVAL,
+    DEFAULT_DAILY_REQUEST_BUDGET,
+    DEFAULT_IMPORT_INTERVAL,
+    DEFAULT_IMPORT_WORKERS,
     DOMAIN,
+    ENDPOINT_GET_FORECAST,
+    ENDPOINT_GET_USAGE_PER_DEGREE_DAY,
+    ENDPOINT_GET_YEARLY_USAGE,
+    ENDPOINT_POST_METER,
+    MAX_IMPORT_WORKERS,
+    MIN_IMPORT_INTERVAL,
+    REFRESH_DEADLINE,
     SENSOR_PLATFORM,
+    SIGNAL_STATS_UPDATED,
+    STALE_AFTER,
+    TASK_DRAIN_TIMEOUT,
 )
+from .history import SnapshotHistory
+from .intraday import IntradayUploader, async_remove_intraday
+from .midnight import MidnightReadingTracker
+from .prefetch import async_pop_prefetch
+from .profiling import async_profile_cycle
+from .importer import (
+    InvalidImportFile,
+    MeterReadingImporter,
+    async_remove_checkpoints,
+    resolve_import_path,
+)
+from .websocket_api import async_setup_websocket, entry_snapshot
+from .schedule import DailyJob, pick_post_time, pick_refresh_time
+from .tasks import Outbox, TaskSupervisor
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,11 +89,48 @@ ENTITY_ICON = "mdi:gas-cylinder"
 # Service/Action names
 SERVICE_UPDATE_STATS = "update_stats"
 SERVICE_POST_METER_READING = "post_meter_reading"
+SERVICE_IMPORT_READINGS = "import_readings"
+SERVICE_PROFILE = "profile"
+
+STATS_ENDPOINTS = {
+    "yearly_usage": ENDPOINT_GET_YEARLY_USAGE,
+    "forecast": ENDPOINT_GET_FORECAST,
+    "degree_day": ENDPOINT_GET_USAGE_PER_DEGREE_DAY,
+}
+
+ATTR_FILE = "file"
+ATTR_WORKERS = "workers"
+ATTR_INTERVAL = "interval"
+ATTR_CYCLE = "cycle"
+
+CYCLE_REFRESH = "refresh"
+CYCLE_POST = "post"
+
+IMPORT_READINGS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_FILE): cv.string,
+        vol.Optional(ATTR_WORKERS, default=DEFAULT_IMPORT_WORKERS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_IMPORT_WORKERS)
+        ),
+        vol.Optional(ATTR_INTERVAL, default=DEFAULT_IMPORT_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=MIN_IMPORT_INTERVAL)
+        ),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLE, default=CYCLE_REFRESH): vol.In(
+            [CYCLE_REFRESH, CYCLE_POST]
+        ),
+    }
+)
 
 
 async def async_setup(hass: HomeAssistant, config: dict) -> bool:
     """Set up MinderGas integration from YAML config (if any)."""
     # This integration uses config flow, so no YAML setup
+    async_setup_websocket(hass)
     return True
 
 
@@ -59,8 +154,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             _LOGGER.error("API key not configured for MinderGas integration")
             return False
         
-        _LOGGER.debug("API key found, initializing MinderGasAPI")
-        api = MinderGasAPI(api_key, session=None)
+        # Reuse the client and stats of the config flow that created the entry
+        prefetch = async_pop_prefetch(hass, api_key)
+        if prefetch is not None:
+            _LOGGER.debug("Reusing MinderGasAPI of the config flow")
+            api = prefetch.api
+        else:
+            _LOGGER.debug("API key found, initializing MinderGasAPI")
+            api = MinderGasAPI(
+                api_key,
+                session=None,
+                refresh_cooldown=entry.options.get(
+                    CONF_REFRESH_COOLDOWN, DEFAULT_REFRESH_COOLDOWN
+                ),
+            )
         _LOGGER.debug("MinderGasAPI initialized")
         
         hass.data[DOMAIN][entry.entry_id] = {
@@ -71,6 +178,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             "yearly_usage": None,
             "forecast": None,
             "degree_day": None,
+            "last_fetched": None,
+            "incomplete": [],
+            "supervisor": TaskSupervisor(hass, entry),
+            "outbox": Outbox(hass, entry.entry_id),
         }
         _LOGGER.debug("Integration data structure initialized")
         
@@ -83,111 +194,306 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         """Get option value, falling back to config entry data."""
         return entry.options.get(key, entry.data.get(key, default))
     
-    # Fetch and store initial stats data
+    # Load persisted snapshot history used for day-over-day deltas
+    history = SnapshotHistory(hass, entry.entry_id)
+    await history.async_load()
+    hass.data[DOMAIN][entry.entry_id]["history"] = history
+    hass.data[DOMAIN][entry.entry_id]["last_fetched"] = history.last_fetched
+    # Seed the stats from before the restart, in case the fetch is skipped
+    hass.data[DOMAIN][entry.entry_id].update(history.payloads)
+    supervisor: TaskSupervisor = hass.data[DOMAIN][entry.entry_id]["supervisor"]
+    outbox: Outbox = hass.data[DOMAIN][entry.entry_id]["outbox"]
+    await outbox.async_load()
+    
+    # Fetch and store initial stats data, unless the data from before the
+    # restart (seeded from the history above) is still fresh
     if get_option(CONF_UPDATE_STATS):
-        try:
-            _LOGGER.info("Fetching initial stats data...")
-            yearly_usage = await api.get_yearly_usage()
-            forecast = await api.get_yearly_forecast()
-            degree_day = await api.get_usage_per_degree_day()
+        age = (
+            dt_util.utcnow() - history.last_fetched
+            if history.last_fetched
+            else None
+        )
+        if prefetch is not None and prefetch.has_stats:
+            _LOGGER.info("Using the stats fetched while adding the integration")
+            _async_store_stats(
+                hass,
+                entry.entry_id,
+                prefetch.yearly_usage,
+                prefetch.forecast,
+                prefetch.degree_day,
+                prefetch.fetched_at,
+            )
+        elif age is not None and age < STALE_AFTER:
+            _LOGGER.info("Stats fetched %s ago are still fresh, skipping fetch", age)
             
-            # Store data in hass.data
-            if yearly_usage:
-                hass.data[DOMAIN][entry.entry_id]["yearly_usage"] = yearly_usage
-                _LOGGER.debug("Stored yearly_usage data: %s", yearly_usage)
-            if forecast:
-                hass.data[DOMAIN][entry.entry_id]["forecast"] = forecast
-                _LOGGER.debug("Stored forecast data: %s", forecast)
-            if degree_day:
-                hass.data[DOMAIN][entry.entry_id]["degree_day"] = degree_day
-                _LOGGER.debug("Stored degree_day data: %s", degree_day)
+            async def refresh_stats():
+                """Refresh the stats once the restored data becomes stale."""
+                try:
+                    await async_refresh_stats(hass, entry.entry_id)
+                except Exception as err:
+                    _LOGGER.warning("Failed to refresh stale stats: %s", err)
             
-            _LOGGER.info("Initial stats data fetched successfully")
-        except Exception as err:
-            _LOGGER.warning("Failed to fetch initial stats: %s", err)
+            @callback
+            def refresh_when_stale(_now):
+                """Start the stale data refresh under supervision."""
+                supervisor.async_spawn("stale_refresh", refresh_stats())
+            
+            hass.data[DOMAIN][entry.entry_id]["unsub_tracker"].append(
+                async_call_later(hass, STALE_AFTER - age, refresh_when_stale)
+            )
+        else:
+            await _async_initial_refresh(hass, entry, history)
     
-    # Set up platforms 
-    hass.async_create_task(
-        hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    )
-    _LOGGER.debug("Platform setup task created")
+    # Start intraday sampling and batched uploads if enabled
+    meter_entity_id = get_option(CONF_POST_METER_ENTITY_ID)
+    if (
+        get_option(CONF_POST_METER_READING)
+        and get_option(CONF_INTRADAY_READINGS)
+        and meter_entity_id
+    ):
+        uploader = IntradayUploader(
+            hass,
+            entry.entry_id,
+            api,
+            meter_entity_id,
+            interval=timedelta(
+                minutes=int(get_option(CONF_INTRADAY_INTERVAL, DEFAULT_INTRADAY_INTERVAL))
+            ),
+            daily_budget=int(
+                get_option(CONF_DAILY_REQUEST_BUDGET, DEFAULT_DAILY_REQUEST_BUDGET)
+            ),
+            supervisor=supervisor,
+        )
+        await uploader.async_load()
+        hass.data[DOMAIN][entry.entry_id]["uploader"] = uploader
+        hass.data[DOMAIN][entry.entry_id]["unsub_tracker"].extend(
+            uploader.async_start()
+        )
+    
+    # Schedule the daily meter reading post within the posting window
+    if get_option(CONF_POST_METER_READING) and meter_entity_id:
+        # Track the meter so the post uses its value at midnight
+        tracker = MidnightReadingTracker(hass, meter_entity_id)
+        hass.data[DOMAIN][entry.entry_id]["midnight_tracker"] = tracker
+        hass.data[DOMAIN][entry.entry_id]["unsub_tracker"].extend(
+            tracker.async_start()
+        )
+        
+        rng = Random()
+        post_job = DailyJob(
+            hass,
+            "meter reading post",
+            lambda: pick_post_time(
+                get_option(CONF_POST_TIME),
+                bool(get_option(CONF_RANDOMIZE_POST_TIME)),
+                rng,
+            ),
+            lambda: supervisor.async_run(
+                "scheduled_post",
+                async_daily_post(hass, entry.entry_id, meter_entity_id),
+            ),
+        )
+        hass.data[DOMAIN][entry.entry_id]["post_job"] = post_job
+        hass.data[DOMAIN][entry.entry_id]["unsub_tracker"].append(
+            post_job.async_start()
+        )
+    
+    # Schedule the daily stats refresh, moving it to shortly after the time
+    # MinderGas is learned to publish new data
+    if get_option(CONF_UPDATE_STATS):
+        stats_job = DailyJob(
+            hass,
+            "stats refresh",
+            lambda: pick_refresh_time(
+                get_option(CONF_UPDATE_TIME), history.change_minutes
+            ),
+            lambda: supervisor.async_run(
+                "scheduled_refresh", async_scheduled_refresh(hass, entry.entry_id)
+            ),
+        )
+        hass.data[DOMAIN][entry.entry_id]["stats_job"] = stats_job
+        hass.data[DOMAIN][entry.entry_id]["unsub_tracker"].append(
+            stats_job.async_start()
+        )
+    
+    # Set up platforms once their data is in place
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    _LOGGER.debug("Platforms set up")
+    
+    # Retry readings that could not be posted before the last shutdown
+    if len(outbox):
+        supervisor.async_spawn("outbox", async_replay_outbox(hass, entry.entry_id))
     
     # Register service/action handlers
-    async def handle_update_stats(call):
+    async def handle_update_stats(call: ServiceCall) -> ServiceResponse:
         """Handle update_stats action."""
         _LOGGER.info("Action 'update_stats' triggered")
-        api = hass.data[DOMAIN][entry.entry_id]["api"]
+        data = hass.data[DOMAIN][entry.entry_id]
+        previous_fetch = data["last_fetched"]
+        response: dict[str, Any] = {"success": False, "changed": False}
         try:
-            _LOGGER.debug("Fetching yearly usage...")
-            yearly_usage = await api.get_yearly_usage()
-            _LOGGER.debug("Yearly usage retrieved: %s", yearly_usage)
-            
-            _LOGGER.debug("Fetching yearly forecast...")
-            forecast = await api.get_yearly_forecast()
-            _LOGGER.debug("Yearly forecast retrieved: %s", forecast)
-            
-            _LOGGER.debug("Fetching usage per degree day...")
-            degree_day = await api.get_usage_per_degree_day()
-            _LOGGER.debug("Usage per degree day retrieved: %s", degree_day)
-            
-            if yearly_usage is not None:
-                hass.data[DOMAIN][entry.entry_id]["yearly_usage"] = yearly_usage
-            if forecast is not None:
-                hass.data[DOMAIN][entry.entry_id]["forecast"] = forecast
-            if degree_day is not None:
-                hass.data[DOMAIN][entry.entry_id]["degree_day"] = degree_day
-            
-            _LOGGER.info("Manual stats update completed successfully")
-            
-            # Refresh sensor states by firing event that sensors listen to
-            hass.bus.async_fire(
-                f"{DOMAIN}_stats_updated",
-                {"entry_id": entry.entry_id}
+            response["changed"] = bool(
+                await supervisor.async_run(
+                    "update_stats", async_refresh_stats(hass, entry.entry_id)
+                )
             )
         except Exception as err:
             _LOGGER.error("Error updating stats: %s", err, exc_info=True)
+            response["error"] = str(err)
+        else:
+            # The client returns None for unreachable endpoints instead of
+            # raising, so success depends on what this refresh got back
+            failed = sorted(set(data["incomplete"]) | set(_failed_stats(data["api"])))
+            response["failed"] = failed
+            response["success"] = data["last_fetched"] != previous_fetch or len(
+                failed
+            ) < len(STATS_ENDPOINTS)
+            if response["success"]:
+                _LOGGER.info("Manual stats update completed successfully")
+            else:
+                _LOGGER.error("Manual stats update failed for all endpoints")
+        
+        if not call.return_response:
+            return None
+        return {
+            **response,
+            "snapshot": entry_snapshot(hass, entry.entry_id),
+            "requests": _request_stats(data["api"], tuple(STATS_ENDPOINTS.values())),
+        }
     
-    async def handle_post_meter_reading(call):
+    async def handle_post_meter_reading(call: ServiceCall) -> ServiceResponse:
         """Handle post_meter_reading action."""
         _LOGGER.info("Action 'post_meter_reading' triggered")
-        api = hass.data[DOMAIN][entry.entry_id]["api"]
-        meter_entity_id = get_option(CONF_POST_METER_ENTITY_ID)
+        result = await supervisor.async_run(
+            "post_meter_reading",
+            async_post_meter_reading(
+                hass, entry.entry_id, get_option(CONF_POST_METER_ENTITY_ID)
+            ),
+        )
         
-        _LOGGER.debug("Meter entity ID configured: %s", meter_entity_id)
+        if not call.return_response:
+            return None
+        data = hass.data[DOMAIN][entry.entry_id]
+        last_post = data.get("last_post") or {}
+        return {
+            "success": bool(result),
+            "date": last_post.get("date"),
+            "reading": last_post.get("reading"),
+            "queued": last_post.get("date") in data["outbox"],
+            "requests": _request_stats(data["api"], (ENDPOINT_POST_METER,)),
+        }
+    
+    async def handle_import_readings(call):
+        """Handle import_readings action."""
+        _LOGGER.info("Action 'import_readings' triggered")
+        data = hass.data[DOMAIN][entry.entry_id]
         
-        if not meter_entity_id:
-            _LOGGER.error("Meter entity ID not configured")
+        running = data.get("import_task")
+        if running is not None and not running.done():
+            _LOGGER.error("An import is already running")
             return
         
-        meter_value = hass.states.get(meter_entity_id)
-        if not meter_value:
-            _LOGGER.error("Meter entity %s not found", meter_entity_id)
+        path = await hass.async_add_executor_job(
+            resolve_import_path, hass, call.data[ATTR_FILE]
+        )
+        if path is None:
+            _LOGGER.error(
+                "Import file %s is not inside the config directory",
+                call.data[ATTR_FILE],
+            )
             return
         
-        _LOGGER.debug("Meter entity state: %s", meter_value.state)
+        importer = MeterReadingImporter(
+            hass,
+            entry.entry_id,
+            data["api"],
+            path,
+            workers=call.data[ATTR_WORKERS],
+            interval=call.data[ATTR_INTERVAL],
+        )
         
-        try:
-            reading = float(meter_value.state)
-            _LOGGER.debug("Parsed meter reading: %s", reading)
-            
-            # Post reading for today
-            date_str = datetime.now().strftime("%Y-%m-%d")
-            _LOGGER.debug("Posting meter reading for date: %s, value: %s", date_str, reading)
-            
-            result = await api.post_meter_reading(date_str, reading)
-            _LOGGER.info("Manual meter reading posted successfully: date=%s, reading=%s, result=%s", date_str, reading, result)
-        except Exception as err:
-            _LOGGER.error("Error posting meter reading: %s", err, exc_info=True)
+        async def run_import():
+            """Run the import, logging rather than raising failures."""
+            try:
+                await importer.async_run()
+            except InvalidImportFile as err:
+                _LOGGER.error("Cannot import meter readings: %s", err)
+            except Exception as err:
+                _LOGGER.error("Error importing meter readings: %s", err, exc_info=True)
+        
+        # Imports can take hours at the paced rate, so don't block the call
+        data["import_task"] = supervisor.async_spawn(
+            "import_readings", run_import(), long_running=True
+        )
+    
+    async def handle_profile(call: ServiceCall) -> ServiceResponse:
+        """Handle profile action."""
+        cycle = call.data[ATTR_CYCLE]
+        _LOGGER.info("Action 'profile' triggered for the %s cycle", cycle)
+        
+        if cycle == CYCLE_POST:
+            def job():
+                return supervisor.async_run(
+                    "post_meter_reading",
+                    async_post_meter_reading(
+                        hass, entry.entry_id, get_option(CONF_POST_METER_ENTITY_ID)
+                    ),
+                )
+        else:
+            def job():
+                # Bypass the response cache so the requests are profiled too
+                hass.data[DOMAIN][entry.entry_id]["api"].invalidate_cache()
+                return supervisor.async_run(
+                    "update_stats", async_refresh_stats(hass, entry.entry_id)
+                )
+        
+        return await async_profile_cycle(hass, cycle, job)
     
     try:
         _LOGGER.debug("Registering services")
-        hass.services.async_register(DOMAIN, SERVICE_UPDATE_STATS, handle_update_stats)
-        hass.services.async_register(DOMAIN, SERVICE_POST_METER_READING, handle_post_meter_reading)
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_UPDATE_STATS,
+            handle_update_stats,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+        hass.services.async_register(
+            DOMAIN,
+            SERVICE_POST_METER_READING,
+            handle_post_meter_reading,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+        # Admin only, as it reads files from the config directory
+        async_register_admin_service(
+            hass,
+            DOMAIN,
+            SERVICE_IMPORT_READINGS,
+            handle_import_readings,
+            schema=IMPORT_READINGS_SCHEMA,
+        )
+        # Admin only, as it writes profile files to the config directory
+        async_register_admin_service(
+            hass,
+            DOMAIN,
+            SERVICE_PROFILE,
+            handle_profile,
+            schema=PROFILE_SCHEMA,
+            supports_response=SupportsResponse.ONLY,
+        )
         _LOGGER.debug("Services registered successfully")
     except Exception as err:
         _LOGGER.error("Error registering services: %s", err, exc_info=True)
         return False
     
+    # Let running jobs finish (or persist their work) when HA stops
+    async def drain_on_stop(_event: Event) -> None:
+        """Drain background jobs on shutdown."""
+        await _async_drain(hass.data[DOMAIN][entry.entry_id])
+    
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, drain_on_stop)
+    )
+    
     # Setup options flow
     try:
         _LOGGER.debug("Setting up options flow")
@@ -201,14 +507,372 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 
+async def _async_initial_refresh(
+    hass: HomeAssistant, entry: ConfigEntry, history: SnapshotHistory
+) -> None:
+    """
+    Fetch the initial stats of an entry.
+    
+    Raises ConfigEntryError when the API key is rejected for good, and
+    ConfigEntryNotReady when MinderGas can't be reached and there is no
+    earlier data to fall back on, so Home Assistant retries the setup.
+    """
+    data = hass.data[DOMAIN][entry.entry_id]
+    api = data["api"]
+    
+    async def abort_setup():
+        """Release the resources of the entry before failing setup."""
+        hass.data[DOMAIN].pop(entry.entry_id, None)
+        await api.close()
+    
+    _LOGGER.info("Fetching initial stats data...")
+    restored_fetch = data["last_fetched"]
+    try:
+        await async_refresh_stats(hass, entry.entry_id)
+    except (MinderGasAuthError, MinderGasPaymentRequiredError) as err:
+        await abort_setup()
+        raise ConfigEntryError(f"MinderGas rejected the API key: {err}") from err
+    except MinderGasError as err:
+        if history.last_fetched is None:
+            await abort_setup()
+            raise ConfigEntryNotReady(f"MinderGas is not available: {err}") from err
+        _LOGGER.warning("Failed to fetch initial stats, using restored data: %s", err)
+        return
+    
+    # last_fetched starts out as the restored fetch time, so only a newer
+    # one shows that this fetch produced data
+    if data["last_fetched"] is not None and data["last_fetched"] != restored_fetch:
+        _LOGGER.info("Initial stats data fetched successfully")
+        return
+    
+    # No payload at all: fine for a new account, but only if every endpoint
+    # returned 404, as a connection error or 5xx on one would be hidden
+    failed = sorted(set(data["incomplete"]) | set(_failed_stats(api)))
+    if not failed:
+        _LOGGER.info("No stats available from MinderGas yet")
+    elif history.last_fetched is None:
+        await abort_setup()
+        raise ConfigEntryNotReady(
+            f"Could not fetch stats from MinderGas: {', '.join(failed)}"
+        )
+    else:
+        _LOGGER.warning(
+            "Failed to fetch initial stats (%s), using restored data",
+            ", ".join(failed),
+        )
+
+
+async def async_refresh_stats(hass: HomeAssistant, entry_id: str) -> bool:
+    """
+    Fetch all stats for an entry, store them and notify the sensors.
+    
+    Returns True if the fetched payloads differ from the previous ones.
+    When nothing changed, only the fetch time and today's history slot are
+    updated and the sensors are not notified.
+    """
+    data = hass.data[DOMAIN][entry_id]
+    api = data["api"]
+    
+    # Fetch all endpoints concurrently within one overall deadline
+    tasks = {
+        "yearly_usage": asyncio.create_task(api.get_yearly_usage()),
+        "forecast": asyncio.create_task(api.get_yearly_forecast()),
+        "degree_day": asyncio.create_task(api.get_usage_per_degree_day()),
+    }
+    try:
+        done, pending = await asyncio.wait(tasks.values(), timeout=REFRESH_DEADLINE)
+    except asyncio.CancelledError:
+        for task in tasks.values():
+            task.cancel()
+        raise
+    
+    if pending:
+        api.cancel_inflight()
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+    
+    data["incomplete"] = [key for key, task in tasks.items() if task not in done]
+    if data["incomplete"]:
+        _LOGGER.warning(
+            "Stats refresh hit its %ss deadline, keeping previous data for: %s",
+            REFRESH_DEADLINE,
+            ", ".join(data["incomplete"]),
+        )
+    
+    # Surface errors the client raises (invalid API key) like before
+    for task in done:
+        if task.exception() is not None:
+            raise task.exception()
+    
+    results = {
+        key: task.result() if task in done else None for key, task in tasks.items()
+    }
+    yearly_usage = results["yearly_usage"]
+    forecast = results["forecast"]
+    degree_day = results["degree_day"]
+    _LOGGER.debug(
+        "Stats retrieved: yearly_usage=%s, forecast=%s, degree_day=%s",
+        yearly_usage,
+        forecast,
+        degree_day,
+    )
+    
+    return _async_store_stats(hass, entry_id, yearly_usage, forecast, degree_day)
+
+
+@callback
+def _async_store_stats(
+    hass: HomeAssistant,
+    entry_id: str,
+    yearly_usage: Optional[dict],
+    forecast: Optional[dict],
+    degree_day: Optional[dict],
+    fetched_at: Optional[datetime] = None,
+) -> bool:
+    """
+    Store fetched stats for an entry and notify the sensors if they changed.
+    
+    Stats that were not fetched (None) keep their previous value.
+    """
+    data = hass.data[DOMAIN][entry_id]
+    if all(value is None for value in (yearly_usage, forecast, degree_day)):
+        return False
+    
+    if yearly_usage is not None:
+        data["yearly_usage"] = yearly_usage
+    if forecast is not None:
+        data["forecast"] = forecast
+    if degree_day is not None:
+        data["degree_day"] = degree_day
+    data["last_fetched"] = fetched_at or dt_util.utcnow()
+    
+    content_hash = _content_hash(data)
+    history = data.get("history")
+    previous_hash = history.content_hash if history is not None else None
+    if history is not None:
+        history.record(
+            dt_util.now().date(),
+            data["yearly_usage"],
+            data["forecast"],
+            data["degree_day"],
+            content_hash,
+            data["last_fetched"],
+        )
+    
+    if content_hash == previous_hash:
+        _LOGGER.debug("Stats unchanged since last fetch, only updating fetch time")
+        async_dispatcher_send(hass, SIGNAL_STATS_UPDATED.format(entry_id), False)
+        return False
+    
+    # Refresh the sensors of this entry only, then notify other listeners
+    async_dispatcher_send(hass, SIGNAL_STATS_UPDATED.format(entry_id), True)
+    hass.bus.async_fire(f"{DOMAIN}_stats_updated", {"entry_id": entry_id})
+    return True
+
+
+async def async_scheduled_refresh(
+    hass: HomeAssistant, entry_id: str, attempt: int = 0
+) -> None:
+    """
+    Run a scheduled stats refresh, retrying later while nothing changed.
+    
+    A change seen on a retry brackets the publish time between the previous
+    attempt and this one, so that time is learned. A change seen on the
+    first attempt may have happened earlier, so an hour earlier is noted,
+    which lets the refresh time drift back when MinderGas publishes sooner.
+    """
+    data = hass.data[DOMAIN][entry_id]
+    data["api"].invalidate_cache()
+    changed = await async_refresh_stats(hass, entry_id)
+    
+    now = dt_util.now()
+    minute_of_day = now.hour * 60 + now.minute
+    if changed:
+        if attempt == 0:
+            minute_of_day -= int(ADAPTIVE_REFRESH_RETRY.total_seconds() // 60)
+        data["history"].note_change_time(max(minute_of_day, 0))
+        return
+    
+    # Retry hourly while the publish time is being learned; once it is
+    # known, a single retry covers a late publication
+    history = data["history"]
+    if len(history.change_minutes) < ADAPTIVE_REFRESH_MIN_SAMPLES:
+        retries = ADAPTIVE_REFRESH_RETRIES
+    else:
+        retries = 1
+    if attempt >= retries:
+        _LOGGER.debug("Stats still unchanged after %s retries", attempt)
+        return
+    
+    @callback
+    def retry(_now):
+        """Retry the refresh under supervision."""
+        data["refresh_retry"] = None
+        data["supervisor"].async_spawn(
+            "scheduled_refresh", async_scheduled_refresh(hass, entry_id, attempt + 1)
+        )
+    
+    _LOGGER.debug("Stats unchanged, retrying in %s", ADAPTIVE_REFRESH_RETRY)
+    if (pending := data.get("refresh_retry")) is not None:
+        pending()
+    data["refresh_retry"] = async_call_later(hass, ADAPTIVE_REFRESH_RETRY, retry)
+
+
+def _failed_stats(api: MinderGasAPI) -> list[str]:
+    """Return the stats whose last request failed, as opposed to 2xx or 404."""
+    failed = []
+    for key, endpoint in STATS_ENDPOINTS.items():
+        status = api.request_stats.get(endpoint, {}).get("status")
+        if status is None or not (200 <= status < 300 or status == 404):
+            failed.append(key)
+    return failed
+
+
+def _request_stats(api: MinderGasAPI, endpoints: tuple[str, ...]) -> dict[str, Any]:
+    """Return status, latency and result source of the last call per endpoint."""
+    return {
+        endpoint: dict(api.request_stats[endpoint])
+        for endpoint in endpoints
+        if endpoint in api.request_stats
+    }
+
+
+def _content_hash(data: dict) -> str:
+    """Return a hash of the decoded stats payloads."""
+    payload = json_bytes_sorted(
+        [data["yearly_usage"], data["forecast"], data["degree_day"]]
+    )
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+async def async_post_meter_reading(
+    hass: HomeAssistant,
+    entry_id: str,
+    meter_entity_id: Optional[str],
+    use_midnight_reading: bool = False,
+) -> bool:
+    """
+    Post the current meter reading of an entry to MinderGas.
+    
+    The scheduled post sets use_midnight_reading, to post the value captured
+    at midnight for the start of today instead of the current (later) state.
+    The posted date and reading are kept as "last_post" in the entry data.
+    """
+    data = hass.data[DOMAIN][entry_id]
+    data["last_post"] = None
+    
+    _LOGGER.debug("Meter entity ID configured: %s", meter_entity_id)
+    
+    if not meter_entity_id:
+        _LOGGER.error("Meter entity ID not configured")
+        return False
+    
+    meter_value = hass.states.get(meter_entity_id)
+    if not meter_value:
+        _LOGGER.error("Meter entity %s not found", meter_entity_id)
+        return False
+    
+    _LOGGER.debug("Meter entity state: %s", meter_value.state)
+    
+    try:
+        today = dt_util.now().date()
+        tracker = data.get("midnight_tracker") if use_midnight_reading else None
+        reading = tracker.reading_for(today) if tracker is not None else None
+        if reading is None:
+            reading = float(meter_value.state)
+            if tracker is not None:
+                _LOGGER.warning(
+                    "No midnight reading captured for %s, posting the current"
+                    " state instead",
+                    today,
+                )
+        _LOGGER.debug("Parsed meter reading: %s", reading)
+        
+        date_str = today.strftime("%Y-%m-%d")
+        _LOGGER.debug("Posting meter reading for date: %s, value: %s", date_str, reading)
+        data["last_post"] = {"date": date_str, "reading": reading}
+        
+        result = await _async_post_or_queue(hass, entry_id, date_str, reading)
+        _LOGGER.info("Meter reading posted: date=%s, reading=%s, result=%s", date_str, reading, result)
+        return result
+    except Exception as err:
+        _LOGGER.error("Error posting meter reading: %s", err, exc_info=True)
+        return False
+
+
+async def _async_post_or_queue(
+    hass: HomeAssistant, entry_id: str, date_str: str, reading: float
+) -> bool:
+    """Post a reading, queueing it in the outbox if it may succeed later."""
+    data = hass.data[DOMAIN][entry_id]
+    api = data["api"]
+    outbox = data["outbox"]
+    
+    try:
+        result = await api.post_meter_reading(date_str, reading)
+    except asyncio.CancelledError:
+        outbox.add(date_str, reading)
+        raise
+    
+    if result:
+        outbox.discard(date_str)
+    elif api.last_failure_was_transient(ENDPOINT_POST_METER):
+        _LOGGER.info("Queueing meter reading for %s to retry later", date_str)
+        outbox.add(date_str, reading)
+    return result
+
+
+async def async_replay_outbox(hass: HomeAssistant, entry_id: str) -> None:
+    """Post the readings left in the outbox, oldest first."""
+    data = hass.data[DOMAIN][entry_id]
+    outbox = data["outbox"]
+    
+    for date_str, reading in outbox.items():
+        _LOGGER.debug("Retrying queued meter reading for %s", date_str)
+        if await _async_post_or_queue(hass, entry_id, date_str, reading):
+            continue
+        if data["api"].last_failure_was_transient(ENDPOINT_POST_METER):
+            # Still unreachable, keep the rest for the next attempt
+            return
+        # Rejected for good: posting it again won't help
+        outbox.discard(date_str)
+
+
+async def async_daily_post(
+    hass: HomeAssistant, entry_id: str, meter_entity_id: Optional[str]
+) -> None:
+    """Post queued readings and then today's reading."""
+    await async_replay_outbox(hass, entry_id)
+    await async_post_meter_reading(
+        hass, entry_id, meter_entity_id, use_midnight_reading=True
+    )
+
+
+async def _async_drain(data: dict) -> None:
+    """Stop the schedules, drain the running jobs and persist unsent readings."""
+    for unsub in data.get("unsub_tracker", []):
+        unsub()
+    data["unsub_tracker"] = []
+    if (pending := data.pop("refresh_retry", None)) is not None:
+        pending()
+    
+    cancelled = await data["supervisor"].async_drain(TASK_DRAIN_TIMEOUT)
+    if cancelled:
+        _LOGGER.info("Unfinished jobs were persisted for later: %s", cancelled)
+    await data["outbox"].async_save()
+    # Intraday readings sampled since the last flush are posted after restart
+    if (uploader := data.get("uploader")) is not None:
+        await uploader.async_save()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        # Unsubscribe from scheduled tasks
+        # Stop scheduled tasks and let running jobs finish
         data = hass.data[DOMAIN][entry.entry_id]
-        for unsub in data.get("unsub_tracker", []):
-            unsub()
+        await _async_drain(data)
         
         # Close API session
         api = data.get("api")
@@ -220,6 +884,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data when a config entry is deleted."""
+    await SnapshotHistory(hass, entry.entry_id).async_remove()
+    await Outbox(hass, entry.entry_id).async_remove()
+    await async_remove_intraday(hass, entry.entry_id)
+    await async_remove_checkpoints(hass, entry.entry_id)
+
+
 async def async_update_entry(
     hass: HomeAssistant, config_entry: ConfigEntry
 ) -> None:
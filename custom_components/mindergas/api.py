@@ -1,9 +1,11 @@
 """MinderGas API client."""
+import asyncio
 import logging
-from datetime import datetime
-from typing import Optional
+from time import monotonic
+from typing import Any, Awaitable, Callable, Optional
 
 import aiohttp
+from homeassistant.util.json import json_loads
 
 from .const import (
     API_BASE_URL,
@@ -12,19 +14,97 @@ from .const import (
     ENDPOINT_GET_USAGE_PER_DEGREE_DAY,
     ENDPOINT_GET_YEARLY_USAGE,
     ENDPOINT_POST_METER,
+    DEFAULT_REFRESH_COOLDOWN,
+    MAX_RESPONSE_SIZE,
+    REQUEST_RETRIES,
+    REQUEST_RETRY_DELAY,
+    REQUEST_TIMEOUT,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+READ_CHUNK_SIZE = 8192
+ERROR_SNIPPET_SIZE = 200
+
+# Where the result of a call came from, see MinderGasAPI.request_stats
+SOURCE_NETWORK = "network"
+SOURCE_SHARED = "shared"
+SOURCE_CACHE = "cache"
+
+try:
+    import brotli  # noqa: F401
+
+    ACCEPT_ENCODING = "br, gzip, deflate"
+except ImportError:
+    # aiohttp can only decode brotli when the brotli package is installed
+    ACCEPT_ENCODING = "gzip, deflate"
+
+
+class MinderGasError(Exception):
+    """Base exception for MinderGas API errors."""
+
+
+class MinderGasConnectionError(MinderGasError):
+    """The MinderGas API could not be reached or timed out."""
+
+
+class MinderGasResponseError(MinderGasError):
+    """The MinderGas API returned an unexpected or unusable response."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        """Initialize the error with the HTTP status that caused it."""
+        super().__init__(message)
+        self.status = status
+
+
+class MinderGasServerError(MinderGasResponseError):
+    """The MinderGas API returned a 5xx status."""
+
+
+class MinderGasValidationError(MinderGasResponseError):
+    """The MinderGas API rejected the submitted data (422)."""
+
+
+class MinderGasAccessError(MinderGasResponseError, ValueError):
+    """The API key was rejected (401, 402 or 403)."""
+
+
+class MinderGasAuthError(MinderGasAccessError):
+    """The API key is invalid (401)."""
+
+
+class MinderGasPaymentRequiredError(MinderGasAccessError):
+    """API access expired - payment required (402)."""
+
+
+class MinderGasRateLimitError(MinderGasAccessError):
+    """API access blocked - too many requests (403)."""
+
 
 class MinderGasAPI:
     """MinderGas API client."""
 
-    def __init__(self, api_key: str, session: Optional[aiohttp.ClientSession] = None):
+    def __init__(
+        self,
+        api_key: str,
+        session: Optional[aiohttp.ClientSession] = None,
+        refresh_cooldown: float = DEFAULT_REFRESH_COOLDOWN,
+    ):
         """Initialize the API client."""
         self.api_key = api_key
         self.session = session
+        self.refresh_cooldown = refresh_cooldown
         self._close_session = False
+        # Request coalescing state: in-flight GETs per endpoint, the last
+        # successful GET result per endpoint and in-flight/completed posts
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._cache: dict[str, tuple[float, Any]] = {}
+        self._pending_posts: dict[tuple[str, float], asyncio.Task] = {}
+        self._last_post: Optional[tuple[str, float]] = None
+        # Status, latency and attempts of the last request per endpoint, and
+        # whether the last call was served from the network, a request
+        # shared with another caller or the cache
+        self.request_stats: dict[str, dict[str, Any]] = {}
 
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session."""
@@ -43,14 +123,100 @@ class MinderGasAPI:
         return {
             "Content-Type": "application/json",
             "Accept": "application/json",
+            "Accept-Encoding": ACCEPT_ENCODING,
             "API-VERSION": API_VERSION,
             "AUTH-TOKEN": self.api_key,
         }
 
+    async def _single_flight(
+        self, endpoint: str, fetch: Callable[[], Awaitable[Optional[dict]]]
+    ) -> Optional[dict]:
+        """
+        Run a GET request for an endpoint, coalescing concurrent callers.
+
+        Callers within the refresh cooldown of the last successful request
+        get the cached result, and concurrent callers share the request
+        that is already in flight.
+
+        Args:
+            endpoint: The endpoint being requested, used as coalescing key
+            fetch: Coroutine function performing the actual request
+
+        Returns:
+            The (possibly shared or cached) result of the request
+        """
+        cached = self._cache.get(endpoint)
+        if cached is not None and monotonic() - cached[0] < self.refresh_cooldown:
+            _LOGGER.debug("Serving %s from cache (within refresh cooldown)", endpoint)
+            self._note_source(endpoint, SOURCE_CACHE)
+            return cached[1]
+
+        task = self._inflight.get(endpoint)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(fetch())
+            self._inflight[endpoint] = task
+            task.add_done_callback(lambda _: self._inflight.pop(endpoint, None))
+            source = SOURCE_NETWORK
+        else:
+            _LOGGER.debug("Joining in-flight request for %s", endpoint)
+            source = SOURCE_SHARED
+
+        # Shield the shared task so one cancelled caller does not cancel
+        # the request for everybody else
+        try:
+            result = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            # The shared request was cancelled (see cancel_inflight) while
+            # this caller itself was not: report it as a failed request
+            current = asyncio.current_task()
+            if task.cancelled() and current is not None and not current.cancelling():
+                raise MinderGasConnectionError(
+                    f"Request for {endpoint} was cancelled"
+                ) from None
+            raise
+        if result is not None:
+            self._cache[endpoint] = (monotonic(), result)
+        self._note_source(endpoint, source)
+        return result
+
+    def _note_source(self, endpoint: str, source: str) -> None:
+        """
+        Record where the result of the last call to an endpoint came from.
+
+        A call served from the cache made no request: its elapsed time and
+        attempts are 0, and the status is the one of the earlier request
+        that produced the cached result.
+        """
+        stats = self.request_stats.setdefault(endpoint, {})
+        stats["source"] = source
+        if source == SOURCE_CACHE:
+            stats["elapsed"] = 0.0
+            stats["attempts"] = 0
+
+    def cancel_inflight(self) -> None:
+        """Cancel all GET requests that are still in flight."""
+        for endpoint, task in list(self._inflight.items()):
+            if not task.done():
+                _LOGGER.debug("Cancelling in-flight request for %s", endpoint)
+                task.cancel()
+
+    def last_failure_was_transient(self, endpoint: str) -> bool:
+        """Return whether the last request to an endpoint may succeed later."""
+        status = self.request_stats.get(endpoint, {}).get("status")
+        return status is None or status == 403 or status >= 500
+
+    def invalidate_cache(self) -> None:
+        """Forget cached GET results so the next refresh hits the network."""
+        self._cache.clear()
+
     async def post_meter_reading(self, date: str, reading: float) -> bool:
         """
         Post a meter reading to MinderGas.
 
+        Concurrent posts of the same reading for the same date share a
+        single request, and a repeated post of a reading that was already
+        accepted is skipped.
+
         Args:
             date: Date in format YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS
             reading: The meter reading value
@@ -58,78 +224,79 @@ class MinderGasAPI:
         Returns:
             True if successful, False otherwise
         """
-        session = await self._get_session()
-        url = f"{API_BASE_URL}{ENDPOINT_POST_METER}"
-        data = {"date": date, "reading": reading}
+        if self._last_post == (date, reading):
+            _LOGGER.debug("Meter reading for %s already posted, skipping", date)
+            self._note_source(ENDPOINT_POST_METER, SOURCE_CACHE)
+            return True
+
+        # Only identical posts share a request, so a result is never
+        # attributed to a reading that was not sent
+        key = (date, reading)
+        task = self._pending_posts.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(
+                self._post_meter_reading(date, reading)
+            )
+            self._pending_posts[key] = task
+            task.add_done_callback(lambda _: self._pending_posts.pop(key, None))
+            source = SOURCE_NETWORK
+        else:
+            _LOGGER.debug("Joining in-flight meter reading post for %s", date)
+            source = SOURCE_SHARED
+
+        result = await asyncio.shield(task)
+        if result:
+            self._last_post = (date, reading)
+        self._note_source(ENDPOINT_POST_METER, source)
+        return result
 
+    async def _post_meter_reading(self, date: str, reading: float) -> bool:
+        """Post a meter reading to MinderGas without coalescing."""
         try:
-            async with session.post(url, json=data, headers=self._get_headers()) as resp:
-                if resp.status == 201:
-                    _LOGGER.debug("Successfully posted meter reading: %s", reading)
-                    return True
-                elif resp.status == 401:
-                    _LOGGER.error("Invalid API key")
-                    return False
-                elif resp.status == 402:
-                    _LOGGER.error("Payment required - API access expired")
-                    return False
-                elif resp.status == 403:
-                    _LOGGER.error("API access blocked - too many requests")
-                    return False
-                elif resp.status == 422:
-                    text = await resp.text()
-                    _LOGGER.error("Validation error posting meter reading: %s", text)
-                    return False
-                else:
-                    _LOGGER.error(
-                        "Unexpected status %s posting meter reading: %s",
-                        resp.status,
-                        await resp.text(),
-                    )
-                    return False
-        except Exception as err:
+            await self._request(
+                "POST", ENDPOINT_POST_METER, payload={"date": date, "reading": reading}
+            )
+        except MinderGasValidationError as err:
+            _LOGGER.error("Validation error posting meter reading: %s", err)
+            return False
+        except MinderGasError as err:
             _LOGGER.error("Error posting meter reading: %s", err)
             return False
 
+        _LOGGER.debug("Successfully posted meter reading: %s", reading)
+        return True
+
     async def get_yearly_usage(self) -> Optional[dict]:
         """
         Get yearly usage data.
 
         Returns:
             Dictionary with usage data or None if request failed
+
+        Raises:
+            MinderGasAccessError: If the API key is invalid, expired or blocked
         """
-        session = await self._get_session()
-        url = f"{API_BASE_URL}{ENDPOINT_GET_YEARLY_USAGE}"
+        return await self._single_flight(
+            ENDPOINT_GET_YEARLY_USAGE, self._get_yearly_usage
+        )
 
+    async def _get_yearly_usage(self) -> Optional[dict]:
+        """Request yearly usage data without coalescing."""
         try:
-            async with session.get(url, headers=self._get_headers()) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    _LOGGER.debug("Retrieved yearly usage data")
-                    return data
-                elif resp.status == 404:
-                    _LOGGER.debug("No usage data available yet")
-                    return None
-                elif resp.status == 401:
-                    _LOGGER.error("Invalid API key")
-                    raise ValueError("Invalid API key provided")
-                elif resp.status == 402:
-                    _LOGGER.error("Payment required - API access expired")
-                    raise ValueError("API access expired - payment required")
-                elif resp.status == 403:
-                    _LOGGER.error("API access blocked - too many requests")
-                    raise ValueError("API access blocked - too many requests")
-                else:
-                    _LOGGER.error(
-                        "Unexpected status %s getting yearly usage: %s",
-                        resp.status,
-                        await resp.text(),
-                    )
-                    return None
-        except Exception as err:
+            data = await self._request("GET", ENDPOINT_GET_YEARLY_USAGE)
+        except MinderGasAccessError:
+            # Auth problems are surfaced so the config flow can reject the key
+            raise
+        except MinderGasError as err:
             _LOGGER.error("Error getting yearly usage: %s", err)
             return None
 
+        if data is None:
+            _LOGGER.debug("No usage data available yet")
+        else:
+            _LOGGER.debug("Retrieved yearly usage data")
+        return data
+
     async def get_yearly_forecast(self) -> Optional[dict]:
         """
         Get yearly forecast data.
@@ -137,38 +304,24 @@ class MinderGasAPI:
         Returns:
             Dictionary with forecast data or None if request failed
         """
-        session = await self._get_session()
-        url = f"{API_BASE_URL}{ENDPOINT_GET_FORECAST}"
+        return await self._single_flight(
+            ENDPOINT_GET_FORECAST, self._get_yearly_forecast
+        )
 
+    async def _get_yearly_forecast(self) -> Optional[dict]:
+        """Request yearly forecast data without coalescing."""
         try:
-            async with session.get(url, headers=self._get_headers()) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    _LOGGER.debug("Retrieved yearly forecast data")
-                    return data
-                elif resp.status == 404:
-                    _LOGGER.debug("Not enough data to forecast yet")
-                    return None
-                elif resp.status == 401:
-                    _LOGGER.error("Invalid API key")
-                    return None
-                elif resp.status == 402:
-                    _LOGGER.error("Payment required - API access expired")
-                    return None
-                elif resp.status == 403:
-                    _LOGGER.error("API access blocked - too many requests")
-                    return None
-                else:
-                    _LOGGER.error(
-                        "Unexpected status %s getting yearly forecast: %s",
-                        resp.status,
-                        await resp.text(),
-                    )
-                    return None
-        except Exception as err:
+            data = await self._request("GET", ENDPOINT_GET_FORECAST)
+        except MinderGasError as err:
             _LOGGER.error("Error getting yearly forecast: %s", err)
             return None
 
+        if data is None:
+            _LOGGER.debug("Not enough data to forecast yet")
+        else:
+            _LOGGER.debug("Retrieved yearly forecast data")
+        return data
+
     async def get_usage_per_degree_day(self) -> Optional[dict]:
         """
         Get usage per degree day data.
@@ -176,34 +329,142 @@ class MinderGasAPI:
         Returns:
             Dictionary with usage per degree day or None if request failed
         """
-        session = await self._get_session()
-        url = f"{API_BASE_URL}{ENDPOINT_GET_USAGE_PER_DEGREE_DAY}"
+        return await self._single_flight(
+            ENDPOINT_GET_USAGE_PER_DEGREE_DAY, self._get_usage_per_degree_day
+        )
 
+    async def _get_usage_per_degree_day(self) -> Optional[dict]:
+        """Request usage per degree day data without coalescing."""
         try:
-            async with session.get(url, headers=self._get_headers()) as resp:
-                if resp.status == 200:
-                    data = await resp.json()
-                    _LOGGER.debug("Retrieved usage per degree day data")
-                    return data
-                elif resp.status == 404:
-                    _LOGGER.debug("No usage per degree day data available yet")
-                    return None
-                elif resp.status == 401:
-                    _LOGGER.error("Invalid API key")
-                    return None
-                elif resp.status == 402:
-                    _LOGGER.error("Payment required - API access expired")
-                    return None
-                elif resp.status == 403:
-                    _LOGGER.error("API access blocked - too many requests")
-                    return None
-                else:
-                    _LOGGER.error(
-                        "Unexpected status %s getting usage per degree day: %s",
-                        resp.status,
-                        await resp.text(),
-                    )
-                    return None
-        except Exception as err:
+            data = await self._request("GET", ENDPOINT_GET_USAGE_PER_DEGREE_DAY)
+        except MinderGasError as err:
             _LOGGER.error("Error getting usage per degree day: %s", err)
             return None
+
+        if data is None:
+            _LOGGER.debug("No usage per degree day data available yet")
+        else:
+            _LOGGER.debug("Retrieved usage per degree day data")
+        return data
+
+    async def _request(
+        self, method: str, endpoint: str, payload: Optional[dict] = None
+    ) -> Any:
+        """
+        Perform a request against the MinderGas API.
+
+        This is the single place where responses are read, decoded and mapped
+        to exceptions. GET requests are retried on connection problems and
+        server errors; posts are never retried to avoid duplicate readings.
+
+        Args:
+            method: HTTP method
+            endpoint: API endpoint relative to the base URL
+            payload: Optional JSON body
+
+        Returns:
+            The decoded JSON body, or None for a 404 or an empty body
+
+        Raises:
+            MinderGasError: If the request failed or returned an error status
+        """
+        attempts = 1 + (REQUEST_RETRIES if method == "GET" else 0)
+        for attempt in range(1, attempts + 1):
+            start = monotonic()
+            status: Optional[int] = None
+            try:
+                status, body = await self._send(method, endpoint, payload)
+                return self._decode(status, body)
+            except (MinderGasConnectionError, MinderGasServerError) as err:
+                if attempt == attempts:
+                    raise
+                _LOGGER.debug(
+                    "%s %s failed (%s), retrying in %ss",
+                    method,
+                    endpoint,
+                    err,
+                    REQUEST_RETRY_DELAY,
+                )
+                await asyncio.sleep(REQUEST_RETRY_DELAY)
+            finally:
+                self.request_stats[endpoint] = {
+                    "method": method,
+                    "status": status,
+                    "elapsed": round(monotonic() - start, 3),
+                    "attempts": attempt,
+                }
+
+    async def _send(
+        self, method: str, endpoint: str, payload: Optional[dict]
+    ) -> tuple[int, bytes]:
+        """Send a request and return its status and size-limited raw body."""
+        session = await self._get_session()
+        try:
+            async with session.request(
+                method,
+                f"{API_BASE_URL}{endpoint}",
+                json=payload,
+                headers=self._get_headers(),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+            ) as resp:
+                return resp.status, await self._read_body(resp)
+        except asyncio.TimeoutError as err:
+            raise MinderGasConnectionError(
+                f"Timeout after {REQUEST_TIMEOUT}s requesting {endpoint}"
+            ) from err
+        except aiohttp.ClientError as err:
+            raise MinderGasConnectionError(
+                f"Error requesting {endpoint}: {err}"
+            ) from err
+
+    @staticmethod
+    async def _read_body(resp: aiohttp.ClientResponse) -> bytes:
+        """Read a response body, refusing anything over MAX_RESPONSE_SIZE."""
+        if resp.content_length is not None and resp.content_length > MAX_RESPONSE_SIZE:
+            raise MinderGasResponseError(
+                f"Response of {resp.content_length} bytes exceeds size limit",
+                resp.status,
+            )
+
+        body = bytearray()
+        async for chunk in resp.content.iter_chunked(READ_CHUNK_SIZE):
+            body.extend(chunk)
+            if len(body) > MAX_RESPONSE_SIZE:
+                raise MinderGasResponseError(
+                    f"Response exceeds size limit of {MAX_RESPONSE_SIZE} bytes",
+                    resp.status,
+                )
+        return bytes(body)
+
+    @staticmethod
+    def _decode(status: int, body: bytes) -> Any:
+        """Map a response status to a result or a typed exception."""
+        if status in (200, 201):
+            if not body:
+                return None
+            try:
+                return json_loads(body)
+            except ValueError as err:
+                raise MinderGasResponseError(
+                    f"Invalid JSON in response: {err}", status
+                ) from err
+
+        if status == 404:
+            return None
+
+        text = body[:ERROR_SNIPPET_SIZE].decode("utf-8", errors="replace")
+        if status == 401:
+            raise MinderGasAuthError("Invalid API key provided", status)
+        if status == 402:
+            raise MinderGasPaymentRequiredError(
+                "API access expired - payment required", status
+            )
+        if status == 403:
+            raise MinderGasRateLimitError(
+                "API access blocked - too many requests", status
+            )
+        if status == 422:
+            raise MinderGasValidationError(text, status)
+        if status >= 500:
+            raise MinderGasServerError(f"Server error {status}: {text}", status)
+        raise MinderGasResponseError(f"Unexpected status {status}: {text}", status)
@@ -9,7 +9,8 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import selector
 
-from .api import MinderGasAPI
+from .api import MinderGasAccessError, MinderGasAPI
+from .prefetch import async_prefetch_stats, async_store_prefetch
 from .const import (
     CONF_API_KEY,
     CONF_POST_METER_READING,
@@ -18,7 +19,14 @@ from .const import (
     CONF_UPDATE_STATS,
     CONF_UPDATE_TIME,
     CONF_RANDOMIZE_POST_TIME,
+    CONF_REFRESH_COOLDOWN,
+    CONF_INTRADAY_READINGS,
+    CONF_INTRADAY_INTERVAL,
+    CONF_DAILY_REQUEST_BUDGET,
     DEFAULT_POST_TIME,
+    DEFAULT_REFRESH_COOLDOWN,
+    DEFAULT_INTRADAY_INTERVAL,
+    DEFAULT_DAILY_REQUEST_BUDGET,
     DEFAULT_UPDATE_TIME,
     DOMAIN,
     POST_METER_WINDOW_START,
@@ -86,22 +94,24 @@ class MinderGasConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 # Test the API key
                 api = MinderGasAPI(api_key)
                 try:
-                    # Try to get yearly usage to validate the API key
-                    result = await api.get_yearly_usage()
+                    # Fetch all stats to validate the API key; the new entry
+                    # reuses them and the client instead of fetching again
+                    # (stats can be None for 404/no data yet)
+                    prefetch = await async_prefetch_stats(api)
                     
                     # If we get here without exception, the API key is valid
-                    # (result can be dict if we have data, None if 404/no data yet)
+                    async_store_prefetch(self.hass, api_key, prefetch)
                     self.api_key = api_key
                     return await self.async_step_meter_config()
                     
-                except ValueError as err:
-                    # API client raises ValueError on auth errors
+                except MinderGasAccessError as err:
+                    # API client raises MinderGasAccessError on auth errors
                     _LOGGER.error("Invalid API key: %s", err)
                     errors[CONF_API_KEY] = "invalid_auth"
+                    await api.close()
                 except Exception as err:
                     _LOGGER.error("Error validating API key: %s", err)
                     errors[CONF_API_KEY] = "cannot_connect"
-                finally:
                     await api.close()
 
         schema = vol.Schema(
@@ -268,6 +278,35 @@ class MinderGasOptionsFlow(config_entries.OptionsFlow):
             ): selector.TimeSelector(
                 selector.TimeSelectorConfig(),
             ),
+            vol.Optional(
+                CONF_INTRADAY_READINGS,
+                default=options.get(CONF_INTRADAY_READINGS, False),
+            ): bool,
+            vol.Optional(
+                CONF_INTRADAY_INTERVAL,
+                default=options.get(CONF_INTRADAY_INTERVAL, DEFAULT_INTRADAY_INTERVAL),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=5,
+                    max=720,
+                    step=5,
+                    unit_of_measurement="min",
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            ),
+            vol.Optional(
+                CONF_DAILY_REQUEST_BUDGET,
+                default=options.get(
+                    CONF_DAILY_REQUEST_BUDGET, DEFAULT_DAILY_REQUEST_BUDGET
+                ),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=1,
+                    max=96,
+                    step=1,
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            ),
             vol.Optional(
                 CONF_UPDATE_STATS,
                 default=options.get(CONF_UPDATE_STATS, True),
@@ -278,6 +317,18 @@ class MinderGasOptionsFlow(config_entries.OptionsFlow):
             ): selector.TimeSelector(
                 selector.TimeSelectorConfig(),
             ),
+            vol.Optional(
+                CONF_REFRESH_COOLDOWN,
+                default=options.get(CONF_REFRESH_COOLDOWN, DEFAULT_REFRESH_COOLDOWN),
+            ): selector.NumberSelector(
+                selector.NumberSelectorConfig(
+                    min=0,
+                    max=3600,
+                    step=30,
+                    unit_of_measurement="s",
+                    mode=selector.NumberSelectorMode.BOX,
+                ),
+            ),
         }
 
         return self.async_show_form(
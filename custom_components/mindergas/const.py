@@ -1,4 +1,5 @@
 """Constants for the MinderGas integration."""
+from datetime import timedelta
 
 DOMAIN = "mindergas"
 ATTRIBUTION = "Data provided by MinderGas"
@@ -10,10 +11,17 @@ CONF_POST_TIME = "post_time"
 CONF_POST_METER_ENTITY_ID = "post_meter_entity_id"
 CONF_UPDATE_STATS = "update_stats"
 CONF_UPDATE_TIME = "update_time"
+CONF_REFRESH_COOLDOWN = "refresh_cooldown"
+CONF_INTRADAY_READINGS = "intraday_readings"
+CONF_INTRADAY_INTERVAL = "intraday_interval"
+CONF_DAILY_REQUEST_BUDGET = "daily_request_budget"
 
 # Default values
 DEFAULT_POST_TIME = "00:30"
 DEFAULT_UPDATE_TIME = "03:00"
+DEFAULT_REFRESH_COOLDOWN = 300  # seconds a fetched result is reused for
+DEFAULT_INTRADAY_INTERVAL = 60  # minutes between meter samples
+DEFAULT_DAILY_REQUEST_BUDGET = 24  # intraday posts per day
 
 # Meter posting restrictions
 POST_METER_WINDOW_START = "00:05"  # 00:05 - earliest time to post
@@ -23,6 +31,11 @@ CONF_RANDOMIZE_POST_TIME = "randomize_post_time"
 # API Configuration
 API_BASE_URL = "https://www.mindergas.nl/api"
 API_VERSION = "1.0"
+REQUEST_TIMEOUT = 20  # seconds per request
+REFRESH_DEADLINE = 60  # seconds for a complete stats refresh cycle
+REQUEST_RETRIES = 1  # extra attempts for GET requests on transient errors
+REQUEST_RETRY_DELAY = 2  # seconds between attempts
+MAX_RESPONSE_SIZE = 64 * 1024  # bytes; responses are small JSON documents
 
 # Endpoints
 ENDPOINT_POST_METER = "/meter_readings"
@@ -30,9 +43,62 @@ ENDPOINT_GET_YEARLY_USAGE = "/yearly_usages/latest"
 ENDPOINT_GET_FORECAST = "/yearly_usages/forecast"
 ENDPOINT_GET_USAGE_PER_DEGREE_DAY = "/usage_per_degree_day"
 
+# Snapshot history
+HISTORY_SIZE = 31  # days kept, enough for a 30 day delta
+HISTORY_DELTA_DAYS = (1, 7, 30)
+HISTORY_STORAGE_VERSION = 1
+HISTORY_SAVE_DELAY = 10  # seconds
+
+# Fetched data older than this is reported as stale and refreshed on startup
+STALE_AFTER = timedelta(hours=24)
+
+# Midnight meter reading capture
+MIDNIGHT_CAPTURE_MINUTE = 4  # capture at 00:04, before the post window opens
+MIDNIGHT_INTERPOLATE_MAX = timedelta(minutes=30)  # max gap to interpolate
+
+# Adaptive stats refresh: learn when MinderGas publishes new data
+ADAPTIVE_REFRESH_MARGIN = timedelta(minutes=15)  # refresh this long after
+ADAPTIVE_REFRESH_RETRY = timedelta(hours=1)  # retry interval when unchanged
+ADAPTIVE_REFRESH_RETRIES = 6
+ADAPTIVE_REFRESH_MIN_SAMPLES = 3
+ADAPTIVE_REFRESH_SAMPLES = 14  # observed change times kept
+ADAPTIVE_REFRESH_LATEST = "23:00"
+
+# Intraday uploads
+INTRADAY_FLUSH_INTERVAL = timedelta(hours=6)
+INTRADAY_STORAGE_VERSION = 1
+
+# Bulk import of historical readings
+IMPORT_CHUNK_SIZE = 500  # lines read from disk at a time
+IMPORT_MAX_CONSECUTIVE_FAILURES = 5
+IMPORT_STORAGE_VERSION = 1
+IMPORT_SAVE_DELAY = 5  # seconds
+DEFAULT_IMPORT_WORKERS = 2
+MAX_IMPORT_WORKERS = 4
+DEFAULT_IMPORT_INTERVAL = 2.0  # seconds between posts
+MIN_IMPORT_INTERVAL = 1.0
+
+# Background task supervision
+TASK_MAX_CONCURRENCY = 3
+TASK_MAX_LONG_RUNNING = 1  # imports, which run for hours at a paced rate
+TASK_DRAIN_TIMEOUT = 10  # seconds to let running jobs finish on unload
+OUTBOX_STORAGE_VERSION = 1
+
 # Sensor platform
 SENSOR_PLATFORM = "sensor"
 
+# Stats fetched by the config flow, kept until the new entry is set up
+PREFETCH_DATA = f"{DOMAIN}_prefetch"
+PREFETCH_TIMEOUT = timedelta(minutes=10)
+
+# On-demand profiling
+PROFILE_TOP = 15  # call stats returned in the service response
+PROFILE_HOT_PATHS = ("mindergas", "aiohttp", "helpers/entity", "json")
+
+# Dispatcher signal sent to the sensors of one entry after a fetch, with
+# whether the stats changed or only the fetch time moved
+SIGNAL_STATS_UPDATED = f"{DOMAIN}_stats_updated_{{}}"
+
 # Service events
 SERVICE_PUSH_READING = "push_reading"
 
@@ -0,0 +1,35 @@
+"""Diagnostics support for the MinderGas integration."""
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_API_KEY, DOMAIN
+
+TO_REDACT = {CONF_API_KEY}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    last_fetched = data.get("last_fetched")
+    jobs = {
+        name: job.next_run.isoformat() if job.next_run else None
+        for name in ("post_job", "stats_job")
+        if (job := data.get(name)) is not None
+    }
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": async_redact_data(dict(entry.options), TO_REDACT),
+        },
+        "last_fetched": last_fetched.isoformat() if last_fetched else None,
+        "incomplete": data.get("incomplete", []),
+        "request_stats": data["api"].request_stats,
+        "tasks": data["supervisor"].diagnostics(),
+        "outbox_size": len(data["outbox"]),
+        "next_runs": jobs,
+    }
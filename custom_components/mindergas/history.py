@@ -0,0 +1,182 @@
+"""Persisted snapshot history for the MinderGas integration."""
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ADAPTIVE_REFRESH_SAMPLES,
+    DOMAIN,
+    HISTORY_DELTA_DAYS,
+    HISTORY_SIZE,
+    HISTORY_STORAGE_VERSION,
+    HISTORY_SAVE_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Decoded API responses persisted as-is, so the latest stats are available
+# before the first fetch after a restart
+PAYLOAD_KEYS = ("yearly_usage", "forecast", "degree_day")
+
+# Order of the values kept per snapshot
+HISTORY_FIELDS = (
+    "usage_heating",
+    "usage_total",
+    "forecast_heating",
+    "forecast_total",
+    "degree_day",
+)
+
+
+def _value(payload: Optional[dict], key: str) -> Optional[float]:
+    """Return the numeric value of a field in a decoded API response."""
+    if payload and isinstance(payload.get(key), dict):
+        return payload[key].get("value")
+    return None
+
+
+def compact_snapshot(
+    yearly_usage: Optional[dict],
+    forecast: Optional[dict],
+    degree_day: Optional[dict],
+) -> list[Optional[float]]:
+    """Reduce decoded API responses to the values listed in HISTORY_FIELDS."""
+    return [
+        _value(yearly_usage, "heating"),
+        _value(yearly_usage, "total"),
+        _value(forecast, "heating"),
+        _value(forecast, "total"),
+        _value(degree_day, "avg_last_365_days"),
+    ]
+
+
+class SnapshotHistory:
+    """
+    Fixed-size ring buffer holding one compact snapshot per day.
+
+    Each day maps to slot ``date.toordinal() % size``, so looking up the
+    snapshot of any day within the buffer is a constant-time operation.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, size: int = HISTORY_SIZE):
+        """Initialize the history."""
+        self._store: Store = Store(
+            hass, HISTORY_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.history"
+        )
+        self._size = size
+        self._days: list[Optional[int]] = [None] * size
+        self._values: list[Optional[list[Optional[float]]]] = [None] * size
+        self._latest: Optional[int] = None
+        self.last_fetched: Optional[datetime] = None
+        self.payloads: dict[str, Optional[dict]] = dict.fromkeys(PAYLOAD_KEYS)
+        # Hash of the last fetched payloads and the minutes of the day at
+        # which they were seen to change, used for adaptive refresh timing
+        self.content_hash: Optional[str] = None
+        self.change_minutes: list[int] = []
+
+    async def async_load(self) -> None:
+        """Load the persisted history."""
+        try:
+            stored = await self._store.async_load()
+        except Exception as err:
+            _LOGGER.warning("Failed to load snapshot history: %s", err)
+            return
+
+        if not stored:
+            return
+
+        for day, values in zip(stored.get("days", []), stored.get("values", [])):
+            if day is not None and len(values) == len(HISTORY_FIELDS):
+                self._set(day, values)
+        if last_fetched := stored.get("last_fetched"):
+            self.last_fetched = dt_util.parse_datetime(last_fetched)
+        payloads = stored.get("payloads") or {}
+        self.payloads = {key: payloads.get(key) for key in PAYLOAD_KEYS}
+        self.content_hash = stored.get("content_hash")
+        self.change_minutes = stored.get("change_minutes", [])[-ADAPTIVE_REFRESH_SAMPLES:]
+        _LOGGER.debug("Loaded snapshot history, latest day: %s", self._latest)
+
+    async def async_remove(self) -> None:
+        """Remove the persisted history."""
+        await self._store.async_remove()
+
+    def record(
+        self,
+        day: date,
+        yearly_usage: Optional[dict],
+        forecast: Optional[dict],
+        degree_day: Optional[dict],
+        content_hash: Optional[str] = None,
+        fetched_at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Record the snapshot of a day, replacing an earlier one that day.
+
+        The fetch time defaults to now, for stats that were just fetched.
+        """
+        self._set(day.toordinal(), compact_snapshot(yearly_usage, forecast, degree_day))
+        self.payloads = dict(zip(PAYLOAD_KEYS, (yearly_usage, forecast, degree_day)))
+        self.last_fetched = fetched_at or dt_util.utcnow()
+        self.content_hash = content_hash
+        self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+
+    def note_change_time(self, minute_of_day: int) -> None:
+        """Remember the minute of the day at which the payloads changed."""
+        self.change_minutes = (self.change_minutes + [minute_of_day])[
+            -ADAPTIVE_REFRESH_SAMPLES:
+        ]
+        self._store.async_delay_save(self._data_to_save, HISTORY_SAVE_DELAY)
+
+    def get(self, day: date) -> Optional[list[Optional[float]]]:
+        """Return the compact snapshot of a day, if it is in the buffer."""
+        ordinal = day.toordinal()
+        slot = ordinal % self._size
+        if self._days[slot] == ordinal:
+            return self._values[slot]
+        return None
+
+    def delta(self, field: str, days: int) -> Optional[float]:
+        """Return the change of a field over a number of days."""
+        if self._latest is None:
+            return None
+
+        index = HISTORY_FIELDS.index(field)
+        latest = date.fromordinal(self._latest)
+        current = self.get(latest)
+        previous = self.get(latest - timedelta(days=days))
+        if current is None or previous is None:
+            return None
+        if current[index] is None or previous[index] is None:
+            return None
+        return round(current[index] - previous[index], 3)
+
+    def trend_attributes(self, field: str) -> dict[str, Any]:
+        """Return the change attributes of a field for each delta period."""
+        return {
+            f"change_{days}d": self.delta(field, days) for days in HISTORY_DELTA_DAYS
+        }
+
+    def _set(self, ordinal: int, values: list[Optional[float]]) -> None:
+        """Store values for a day ordinal."""
+        slot = ordinal % self._size
+        self._days[slot] = ordinal
+        self._values[slot] = values
+        if self._latest is None or ordinal > self._latest:
+            self._latest = ordinal
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the compact representation to persist."""
+        return {
+            "days": self._days,
+            "values": self._values,
+            "last_fetched": (
+                self.last_fetched.isoformat() if self.last_fetched else None
+            ),
+            "payloads": self.payloads,
+            "content_hash": self.content_hash,
+            "change_minutes": self.change_minutes,
+        }
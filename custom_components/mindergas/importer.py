@@ -0,0 +1,317 @@
+"""Bulk import of historical meter readings for the MinderGas integration."""
+import asyncio
+import csv
+import json
+import logging
+import math
+import os
+from datetime import datetime
+from time import monotonic
+from typing import IO, Any, Optional
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import MinderGasAPI
+from .const import (
+    DOMAIN,
+    ENDPOINT_POST_METER,
+    IMPORT_CHUNK_SIZE,
+    IMPORT_MAX_CONSECUTIVE_FAILURES,
+    IMPORT_SAVE_DELAY,
+    IMPORT_STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+CSV_SUFFIXES = (".csv",)
+JSONL_SUFFIXES = (".jsonl", ".ndjson")
+DATE_FORMAT = "%Y-%m-%d"
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+class InvalidImportFile(Exception):
+    """Raised when an import file cannot be used."""
+
+
+def _read_lines(handle: IO[str], count: int) -> list[str]:
+    """Read up to count lines from an open file (runs in the executor)."""
+    lines = []
+    for _ in range(count):
+        line = handle.readline()
+        if not line:
+            break
+        lines.append(line)
+    return lines
+
+
+def parse_row(line: str, is_csv: bool) -> tuple[str, float]:
+    """
+    Parse and validate one line of an import file.
+
+    CSV lines contain ``date,reading``; JSON Lines contain an object with
+    ``date`` and ``reading`` keys.
+
+    Returns:
+        Tuple of the date string and the reading
+
+    Raises:
+        ValueError: If the line is not a valid reading
+    """
+    if is_csv:
+        fields = next(csv.reader([line]))
+        if len(fields) < 2:
+            raise ValueError("expected date and reading columns")
+        date_str, reading_str = fields[0].strip(), fields[1].strip()
+    else:
+        row = json.loads(line)
+        if not isinstance(row, dict):
+            raise ValueError("expected a JSON object")
+        date_str, reading_str = str(row.get("date", "")).strip(), row.get("reading")
+
+    # MinderGas accepts YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS in local time, so
+    # other ISO 8601 forms and timezone offsets are rejected
+    for date_format in (DATE_FORMAT, DATETIME_FORMAT):
+        try:
+            parsed = datetime.strptime(date_str, date_format)
+            break
+        except ValueError:
+            continue
+    else:
+        raise ValueError(f"invalid date {date_str!r}")
+    if parsed.date() > dt_util.now().date():
+        raise ValueError(f"date {date_str} is in the future")
+
+    if isinstance(reading_str, bool):
+        raise ValueError(f"invalid reading {reading_str!r}")
+    try:
+        reading = float(reading_str)
+    except (TypeError, ValueError) as err:
+        raise ValueError(f"invalid reading {reading_str!r}") from err
+    if not math.isfinite(reading):
+        raise ValueError(f"invalid reading {reading_str!r}")
+    if reading < 0:
+        raise ValueError(f"negative reading {reading}")
+
+    return parsed.strftime(date_format), reading
+
+
+class MeterReadingImporter:
+    """
+    Stream a file of historical readings and post them to MinderGas.
+
+    Rows are read in chunks, validated and handed to a bounded pool of
+    workers that share a rate limit. Progress is checkpointed per file as
+    the highest line number up to which every row has been handled, so an
+    interrupted import resumes after the last contiguous completed row.
+    Rows are handled once posted or rejected for good; rows that failed
+    because MinderGas was unreachable hold the checkpoint back so they are
+    retried when the import resumes.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        api: MinderGasAPI,
+        path: str,
+        workers: int,
+        interval: float,
+    ):
+        """Initialize the importer."""
+        self.hass = hass
+        self.api = api
+        self.path = path
+        self.workers = workers
+        self.interval = interval
+        self._is_csv = path.lower().endswith(CSV_SUFFIXES)
+        self._store = _checkpoint_store(hass, entry_id)
+        self._checkpoints: dict[str, int] = {}
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+        self._rate_lock = asyncio.Lock()
+        self._next_slot = 0.0
+        # Line bookkeeping for the checkpoint watermark
+        self._watermark = 0
+        self._handled: set[int] = set()
+        self._failure_run: list[int] = []
+        self._aborted = False
+        self.stats = {
+            "posted": 0,
+            "rejected": 0,
+            "failed": 0,
+            "invalid": 0,
+            "skipped": 0,
+        }
+
+    async def async_run(self) -> dict[str, Any]:
+        """
+        Run the import to completion.
+
+        Returns:
+            Counts of posted, failed, invalid and skipped rows, whether the
+            import was aborted and the line it will resume after
+
+        Raises:
+            InvalidImportFile: If the file type is unsupported or missing
+        """
+        if not self.path.lower().endswith(CSV_SUFFIXES + JSONL_SUFFIXES):
+            raise InvalidImportFile(f"Unsupported file type: {self.path}")
+        if not await self.hass.async_add_executor_job(os.path.isfile, self.path):
+            raise InvalidImportFile(f"File not found: {self.path}")
+
+        self._checkpoints = await self._store.async_load() or {}
+        self._watermark = self._checkpoints.get(self.path, 0)
+        if self._watermark:
+            _LOGGER.info(
+                "Resuming import of %s after line %s", self.path, self._watermark
+            )
+
+        workers = [
+            asyncio.create_task(self._async_worker()) for _ in range(self.workers)
+        ]
+        try:
+            await self._async_produce()
+            await self._queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            self._save_checkpoint()
+            await self._store.async_save(self._checkpoints)
+
+        result = {
+            **self.stats,
+            "aborted": self._aborted,
+            "checkpoint": self._watermark,
+        }
+        _LOGGER.info("Import of %s finished: %s", self.path, result)
+        return result
+
+    async def _async_produce(self) -> None:
+        """Read the file in chunks and queue valid rows for the workers."""
+        handle = await self.hass.async_add_executor_job(
+            open, self.path, "r", -1, "utf-8"
+        )
+        line_no = 0
+        try:
+            while not self._aborted:
+                lines = await self.hass.async_add_executor_job(
+                    _read_lines, handle, IMPORT_CHUNK_SIZE
+                )
+                if not lines:
+                    break
+
+                for line in lines:
+                    line_no += 1
+                    if line_no <= self._watermark:
+                        self.stats["skipped"] += 1
+                        continue
+                    if not line.strip():
+                        self._mark_handled(line_no)
+                        continue
+
+                    try:
+                        date_str, reading = parse_row(line, self._is_csv)
+                    except ValueError as err:
+                        # A CSV header row is expected and not worth a warning
+                        if not (self._is_csv and line_no == 1):
+                            _LOGGER.warning(
+                                "Skipping line %s of %s: %s", line_no, self.path, err
+                            )
+                            self.stats["invalid"] += 1
+                        self._mark_handled(line_no)
+                        continue
+
+                    await self._queue.put((line_no, date_str, reading))
+                    if self._aborted:
+                        break
+        finally:
+            await self.hass.async_add_executor_job(handle.close)
+
+    async def _async_worker(self) -> None:
+        """Post queued readings, respecting the shared rate limit."""
+        while True:
+            line_no, date_str, reading = await self._queue.get()
+            try:
+                if self._aborted:
+                    continue
+                await self._async_wait_for_slot()
+                if await self.api.post_meter_reading(date_str, reading):
+                    self.stats["posted"] += 1
+                    self._failure_run.clear()
+                elif not self.api.last_failure_was_transient(ENDPOINT_POST_METER):
+                    _LOGGER.warning(
+                        "MinderGas rejected line %s of %s (%s: %s)",
+                        line_no,
+                        self.path,
+                        date_str,
+                        reading,
+                    )
+                    self.stats["rejected"] += 1
+                    self._failure_run.clear()
+                else:
+                    # Not handled: the checkpoint stays before this row
+                    _LOGGER.warning(
+                        "Failed to post line %s of %s, it is retried when the"
+                        " import resumes",
+                        line_no,
+                        self.path,
+                    )
+                    self.stats["failed"] += 1
+                    self._failure_run.append(line_no)
+                    if len(self._failure_run) >= IMPORT_MAX_CONSECUTIVE_FAILURES:
+                        _LOGGER.error(
+                            "Aborting import of %s after %s consecutive failures",
+                            self.path,
+                            len(self._failure_run),
+                        )
+                        self._aborted = True
+                    continue
+                self._mark_handled(line_no)
+            finally:
+                self._queue.task_done()
+
+    async def _async_wait_for_slot(self) -> None:
+        """Wait until the next request slot of the shared rate limit."""
+        async with self._rate_lock:
+            delay = self._next_slot - monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self._next_slot = monotonic() + self.interval
+
+    def _mark_handled(self, line_no: int) -> None:
+        """Mark a line as handled and advance the checkpoint watermark."""
+        self._handled.add(line_no)
+        while self._watermark + 1 in self._handled:
+            self._watermark += 1
+            self._handled.discard(self._watermark)
+        self._save_checkpoint()
+
+    def _save_checkpoint(self) -> None:
+        """Schedule persisting the checkpoint of the current file."""
+        self._checkpoints[self.path] = self._watermark
+        self._store.async_delay_save(lambda: self._checkpoints, IMPORT_SAVE_DELAY)
+
+
+def _checkpoint_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store holding the import checkpoints of an entry."""
+    return Store(hass, IMPORT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.import")
+
+
+async def async_remove_checkpoints(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the persisted import checkpoints of an entry."""
+    await _checkpoint_store(hass, entry_id).async_remove()
+
+
+def resolve_import_path(hass: HomeAssistant, file: str) -> Optional[str]:
+    """
+    Resolve a file relative to the config directory, if it is inside it.
+
+    Resolving symlinks touches the filesystem, so run this in the executor.
+    """
+    path = os.path.realpath(hass.config.path(file))
+    config_dir = os.path.realpath(hass.config.config_dir)
+    if os.path.commonpath([path, config_dir]) != config_dir:
+        return None
+    return path
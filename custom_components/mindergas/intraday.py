@@ -0,0 +1,222 @@
+"""Intraday meter reading uploads for the MinderGas integration."""
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from math import ceil
+from typing import Any, Callable, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import MinderGasAPI
+from .const import (
+    DOMAIN,
+    ENDPOINT_POST_METER,
+    INTRADAY_FLUSH_INTERVAL,
+    INTRADAY_STORAGE_VERSION,
+)
+from .tasks import TaskSupervisor
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def select_within_budget(
+    readings: list[tuple[datetime, float]], allowed: int
+) -> list[tuple[datetime, float]]:
+    """
+    Pick at most ``allowed`` evenly spaced readings, always keeping the latest.
+
+    Readings are cumulative meter totals, so dropping intermediate samples
+    only lowers the resolution and never loses consumption.
+    """
+    if allowed <= 0:
+        return []
+    if len(readings) <= allowed:
+        return readings
+
+    step = len(readings) / allowed
+    picked = [readings[len(readings) - 1 - int(i * step)] for i in range(allowed)]
+    return sorted(picked)
+
+
+def _intraday_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the store holding the unsent intraday readings of an entry."""
+    return Store(hass, INTRADAY_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.intraday")
+
+
+async def async_remove_intraday(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the persisted intraday readings of an entry."""
+    await _intraday_store(hass, entry_id).async_remove()
+
+
+class IntradayUploader:
+    """
+    Sample the meter entity during the day and upload readings in batches.
+
+    Samples are aggregated locally into one reading per sampling slot (the
+    last meter value seen in that slot, with the time it was sampled). Every
+    flush interval the buffered readings are posted as timestamped readings,
+    thinned out when needed so the number of requests per day stays within
+    the configured budget. Readings that could not be posted because
+    MinderGas was unreachable are kept for the next flush. The buffer and
+    the requests used today are persisted on unload, so readings sampled
+    since the last flush survive a restart.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        api: MinderGasAPI,
+        meter_entity_id: str,
+        interval: timedelta,
+        daily_budget: int,
+        supervisor: TaskSupervisor,
+    ):
+        """Initialize the uploader."""
+        self.hass = hass
+        self.api = api
+        self.supervisor = supervisor
+        self.meter_entity_id = meter_entity_id
+        self.interval = interval
+        self.daily_budget = daily_budget
+        # Slot start -> (sample time, reading)
+        self._buffer: dict[datetime, tuple[datetime, float]] = {}
+        self._budget_day: Optional[date] = None
+        self._requests_today = 0
+        self._store = _intraday_store(hass, entry_id)
+
+    async def async_load(self) -> None:
+        """Load the readings and request count persisted on the last unload."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+
+        for sampled_str, reading in stored.get("buffer", []):
+            if (sampled := dt_util.parse_datetime(sampled_str)) is not None:
+                sampled = dt_util.as_local(sampled)
+                self._buffer.setdefault(self._slot(sampled), (sampled, reading))
+        if budget_day := stored.get("budget_day"):
+            self._budget_day = date.fromisoformat(budget_day)
+            self._requests_today = stored.get("requests_today", 0)
+        _LOGGER.debug("Restored %s buffered intraday readings", len(self._buffer))
+
+    async def async_save(self) -> None:
+        """Persist the buffered readings and the requests used today."""
+        await self._store.async_save(self._data_to_save())
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the buffer and budget state to persist."""
+        return {
+            "buffer": [
+                [sampled.isoformat(), reading]
+                for sampled, reading in sorted(self._buffer.values())
+            ],
+            "budget_day": self._budget_day.isoformat() if self._budget_day else None,
+            "requests_today": self._requests_today,
+        }
+
+    @callback
+    def async_start(self) -> list[Callable[[], None]]:
+        """Start sampling and flushing, returning the unsubscribe callbacks."""
+        _LOGGER.debug(
+            "Starting intraday uploads for %s every %s (budget %s/day)",
+            self.meter_entity_id,
+            self.interval,
+            self.daily_budget,
+        )
+        return [
+            async_track_time_interval(self.hass, self._async_sample, self.interval),
+            async_track_time_interval(
+                self.hass, self._async_start_flush, INTRADAY_FLUSH_INTERVAL
+            ),
+        ]
+
+    @callback
+    def _async_sample(self, now: datetime) -> None:
+        """Store the current meter value in the slot it belongs to."""
+        state = self.hass.states.get(self.meter_entity_id)
+        if state is None:
+            return
+        try:
+            reading = float(state.state)
+        except ValueError:
+            _LOGGER.debug("Skipping non-numeric meter state: %s", state.state)
+            return
+
+        sampled = dt_util.as_local(now).replace(microsecond=0)
+        self._buffer[self._slot(sampled)] = (sampled, reading)
+
+    def _slot(self, local: datetime) -> datetime:
+        """Return the start of the sampling slot a local time falls in."""
+        slot_seconds = int(self.interval.total_seconds())
+        midnight = local.replace(hour=0, minute=0, second=0, microsecond=0)
+        offset = int((local - midnight).total_seconds()) // slot_seconds * slot_seconds
+        return midnight + timedelta(seconds=offset)
+
+    @callback
+    def _async_start_flush(self, now: datetime) -> None:
+        """Hand a flush of the buffered readings to the task supervisor."""
+        if self._buffer:
+            self.supervisor.async_spawn("intraday_upload", self._async_flush(now))
+
+    async def _async_flush(self, now: datetime) -> None:
+        """Post buffered readings within the remaining daily budget."""
+        if not self._buffer:
+            return
+
+        local = dt_util.as_local(now)
+        if self._budget_day != local.date():
+            self._budget_day = local.date()
+            self._requests_today = 0
+
+        # Spread the remaining budget evenly over the remaining flushes today
+        midnight = (local + timedelta(days=1)).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        flushes_left = max(1, ceil((midnight - local) / INTRADAY_FLUSH_INTERVAL))
+        remaining = self.daily_budget - self._requests_today
+        allowed = ceil(remaining / flushes_left) if remaining > 0 else 0
+
+        readings = sorted(self._buffer.values())
+        batch = select_within_budget(readings, allowed)
+        self._buffer.clear()
+        if len(batch) < len(readings):
+            _LOGGER.debug(
+                "Request budget allows %s of %s intraday readings",
+                len(batch),
+                len(readings),
+            )
+
+        posted = 0
+        for index, (sampled, reading) in enumerate(batch):
+            self._requests_today += 1
+            date_str = sampled.strftime("%Y-%m-%dT%H:%M:%S")
+            try:
+                result = await self.api.post_meter_reading(date_str, reading)
+            except asyncio.CancelledError:
+                # Cancelled while draining, keep the unposted readings so
+                # they are persisted with the buffer
+                self._keep(batch[index:])
+                raise
+            if result:
+                posted += 1
+            elif self.api.last_failure_was_transient(ENDPOINT_POST_METER):
+                _LOGGER.warning(
+                    "Failed to post intraday reading for %s, keeping the rest"
+                    " of this batch for the next flush",
+                    date_str,
+                )
+                self._keep(batch[index:])
+                break
+            else:
+                _LOGGER.warning("MinderGas rejected intraday reading for %s", date_str)
+        _LOGGER.debug("Posted %s intraday readings", posted)
+
+    def _keep(self, readings: list[tuple[datetime, float]]) -> None:
+        """Put unposted readings back into the buffer for the next flush."""
+        # Samples taken meanwhile are newer and win their slot
+        for kept in readings:
+            self._buffer.setdefault(self._slot(kept[0]), kept)
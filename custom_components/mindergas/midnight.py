@@ -0,0 +1,149 @@
+"""Midnight meter reading capture for the MinderGas integration."""
+import logging
+from datetime import date, datetime
+from typing import Callable, Optional
+
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers.event import (
+    async_track_state_change_event,
+    async_track_time_change,
+)
+from homeassistant.util import dt as dt_util
+
+from .const import MIDNIGHT_CAPTURE_MINUTE, MIDNIGHT_INTERPOLATE_MAX
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def value_at(
+    samples: list[tuple[datetime, float]], moment: datetime
+) -> Optional[float]:
+    """
+    Return the meter value at a moment from time-ordered samples.
+
+    The value is interpolated between the last sample before and the first
+    sample after the moment when they are close enough together. Otherwise
+    the last value before the moment is used: a meter whose state did not
+    change simply kept that value.
+
+    Args:
+        samples: (time, value) tuples in chronological order
+        moment: The moment to determine the value for
+
+    Returns:
+        The value at the moment, or None if there is no sample before it
+    """
+    before = None
+    after = None
+    for sample in samples:
+        if sample[0] <= moment:
+            before = sample
+        elif after is None:
+            after = sample
+
+    if before is None:
+        return None
+    if after is None or after[0] - before[0] > MIDNIGHT_INTERPOLATE_MAX:
+        return before[1]
+
+    fraction = (moment - before[0]) / (after[0] - before[0])
+    return round(before[1] + (after[1] - before[1]) * fraction, 3)
+
+
+class MidnightReadingTracker:
+    """
+    Track the meter entity and capture its value at local midnight.
+
+    Only the samples around midnight are kept: the latest meter value, and
+    the last value before and first value after the most recent midnight.
+    A meter updating every few seconds therefore can't push the value from
+    before midnight out. Shortly after midnight, before the posting window
+    opens, the value at 00:00 is determined from them and kept for the daily
+    post job.
+    """
+
+    def __init__(self, hass: HomeAssistant, meter_entity_id: str):
+        """Initialize the tracker."""
+        self.hass = hass
+        self.meter_entity_id = meter_entity_id
+        self._latest: Optional[tuple[datetime, float]] = None
+        self._crossing: Optional[
+            tuple[tuple[datetime, float], tuple[datetime, float]]
+        ] = None
+        self._reading: Optional[tuple[date, float]] = None
+
+    @callback
+    def async_start(self) -> list[Callable[[], None]]:
+        """Start tracking, returning the unsubscribe callbacks."""
+        if (state := self.hass.states.get(self.meter_entity_id)) is not None:
+            self._add_sample(state)
+        return [
+            async_track_state_change_event(
+                self.hass, [self.meter_entity_id], self._async_state_changed
+            ),
+            async_track_time_change(
+                self.hass,
+                self._async_capture,
+                hour=0,
+                minute=MIDNIGHT_CAPTURE_MINUTE,
+                second=0,
+            ),
+        ]
+
+    def reading_for(self, day: date) -> Optional[float]:
+        """Return the captured midnight value at the start of a day."""
+        if self._reading is not None and self._reading[0] == day:
+            return self._reading[1]
+        return None
+
+    @callback
+    def _async_state_changed(self, event: Event) -> None:
+        """Buffer a new meter state."""
+        if (state := event.data.get("new_state")) is not None:
+            self._add_sample(state)
+
+    @callback
+    def _add_sample(self, state: State) -> None:
+        """Add a numeric meter state to the buffer."""
+        try:
+            value = float(state.state)
+        except ValueError:
+            return
+        sample = (state.last_updated, value)
+        latest = self._latest
+        if latest is not None and sample[0] < latest[0]:
+            return
+        if latest is not None and (
+            dt_util.as_local(sample[0]).date() > dt_util.as_local(latest[0]).date()
+        ):
+            # First sample of a new day: keep it with the one before midnight
+            self._crossing = (latest, sample)
+        self._latest = sample
+
+    @callback
+    def _async_capture(self, now: datetime) -> None:
+        """Determine the meter value at the midnight that just passed."""
+        local = dt_util.as_local(now)
+        midnight = local.replace(hour=0, minute=0, second=0, microsecond=0)
+        moment = dt_util.as_utc(midnight)
+        if self._crossing is not None and self._crossing[0][0] <= moment < (
+            self._crossing[1][0]
+        ):
+            samples = list(self._crossing)
+        elif self._latest is not None:
+            # Unchanged since before midnight
+            samples = [self._latest]
+        else:
+            samples = []
+        value = value_at(samples, moment)
+        if value is None:
+            _LOGGER.warning(
+                "No meter reading of %s from before midnight available",
+                self.meter_entity_id,
+            )
+            return
+
+        self._reading = (midnight.date(), value)
+        _LOGGER.debug(
+            "Captured midnight meter reading %s for %s", value, midnight.date()
+        )
@@ -0,0 +1,108 @@
+"""Hand the stats fetched by the config flow over to the new entry."""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.util import dt as dt_util
+
+from .api import MinderGasAPI
+from .const import PREFETCH_DATA, PREFETCH_TIMEOUT
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class PrefetchedStats:
+    """Stats and the client used to fetch them while validating an API key."""
+
+    def __init__(
+        self,
+        api: MinderGasAPI,
+        yearly_usage: Optional[dict[str, Any]],
+        forecast: Optional[dict[str, Any]],
+        degree_day: Optional[dict[str, Any]],
+    ):
+        """Initialize the prefetched stats."""
+        self.api = api
+        self.yearly_usage = yearly_usage
+        self.forecast = forecast
+        self.degree_day = degree_day
+        self.fetched_at: datetime = dt_util.utcnow()
+        self._unsub_expire: Optional[Callable[[], None]] = None
+
+    @property
+    def has_stats(self) -> bool:
+        """Return whether any stats were fetched."""
+        return any(
+            value is not None
+            for value in (self.yearly_usage, self.forecast, self.degree_day)
+        )
+
+
+async def async_prefetch_stats(api: MinderGasAPI) -> PrefetchedStats:
+    """
+    Fetch all stats concurrently, validating the API key on the way.
+
+    Raises:
+        MinderGasAccessError: If the API key is rejected
+    """
+    yearly_usage, forecast, degree_day = await asyncio.gather(
+        api.get_yearly_usage(),
+        api.get_yearly_forecast(),
+        api.get_usage_per_degree_day(),
+        return_exceptions=True,
+    )
+    # Only yearly usage raises; the others return None on errors
+    if isinstance(yearly_usage, BaseException):
+        raise yearly_usage
+    return PrefetchedStats(api, yearly_usage, forecast, degree_day)
+
+
+@callback
+def async_store_prefetch(
+    hass: HomeAssistant, api_key: str, prefetch: PrefetchedStats
+) -> None:
+    """
+    Keep prefetched stats until the entry for an API key is set up.
+
+    If the flow is abandoned, the stats are dropped and the client is
+    closed after PREFETCH_TIMEOUT.
+    """
+    pending: dict[str, PrefetchedStats] = hass.data.setdefault(PREFETCH_DATA, {})
+    if (previous := pending.pop(api_key, None)) is not None:
+        _async_discard(hass, previous)
+
+    @callback
+    def expire(_now: datetime) -> None:
+        """Drop the stats of an abandoned flow."""
+        if pending.get(api_key) is prefetch:
+            _LOGGER.debug("Config flow abandoned, dropping prefetched stats")
+            del pending[api_key]
+            prefetch._unsub_expire = None
+            _async_discard(hass, prefetch)
+
+    prefetch._unsub_expire = async_call_later(hass, PREFETCH_TIMEOUT, expire)
+    pending[api_key] = prefetch
+
+
+@callback
+def async_pop_prefetch(
+    hass: HomeAssistant, api_key: str
+) -> Optional[PrefetchedStats]:
+    """Take the prefetched stats for an API key, if any."""
+    prefetch = hass.data.get(PREFETCH_DATA, {}).pop(api_key, None)
+    if prefetch is not None and prefetch._unsub_expire is not None:
+        prefetch._unsub_expire()
+        prefetch._unsub_expire = None
+    return prefetch
+
+
+@callback
+def _async_discard(hass: HomeAssistant, prefetch: PrefetchedStats) -> None:
+    """Close the client of prefetched stats that won't be used."""
+    if prefetch._unsub_expire is not None:
+        prefetch._unsub_expire()
+    hass.async_create_task(prefetch.api.close())
+
@@ -0,0 +1,92 @@
+"""On-demand profiling of MinderGas refresh and post cycles."""
+import cProfile
+import io
+import logging
+import pstats
+from time import monotonic
+from typing import Any, Awaitable, Callable
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, PROFILE_HOT_PATHS, PROFILE_TOP
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_profile_cycle(
+    hass: HomeAssistant, cycle: str, job: Callable[[], Awaitable[Any]]
+) -> dict[str, Any]:
+    """
+    Run a refresh or post cycle under cProfile.
+
+    The profiler is only created for the duration of the cycle, so there is
+    no overhead when no profile is requested. It records everything running
+    on the event loop meanwhile, which includes the entity state writes
+    triggered by the cycle.
+
+    Args:
+        hass: Home Assistant instance
+        cycle: Name of the cycle, used in the file names
+        job: Callable starting the cycle
+
+    Returns:
+        Duration, result, file paths and the hottest integration call stats
+    """
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError as err:
+        raise HomeAssistantError(f"Cannot start profiler: {err}") from err
+
+    start = monotonic()
+    try:
+        result = await job()
+    finally:
+        profiler.disable()
+    duration = round(monotonic() - start, 3)
+
+    stamp = dt_util.now().strftime("%Y%m%d_%H%M%S")
+    base = hass.config.path(f"{DOMAIN}_profile_{cycle}_{stamp}")
+    hot_paths = await hass.async_add_executor_job(_write_profile, profiler, base)
+    _LOGGER.info("Profile of %s cycle written to %s.prof", cycle, base)
+
+    return {
+        "cycle": cycle,
+        "duration": duration,
+        "result": result,
+        "profile_file": f"{base}.prof",
+        "summary_file": f"{base}.txt",
+        "hot_paths": hot_paths,
+    }
+
+
+def _write_profile(profiler: cProfile.Profile, base: str) -> list[dict[str, Any]]:
+    """Write the raw and text profiles, returning the hottest matching calls."""
+    profiler.dump_stats(f"{base}.prof")
+
+    stream = io.StringIO()
+    stats = pstats.Stats(profiler, stream=stream).sort_stats("cumulative")
+    stats.print_stats()
+    with open(f"{base}.txt", "w", encoding="utf-8") as file:
+        file.write(stream.getvalue())
+
+    hot_paths = [
+        {
+            "function": f"{filename}:{line}({name})",
+            "calls": calls,
+            "total_time": round(total_time, 6),
+            "cumulative_time": round(cumulative_time, 6),
+        }
+        for (filename, line, name), (
+            _,
+            calls,
+            total_time,
+            cumulative_time,
+            _,
+        ) in stats.stats.items()
+        if any(path in filename for path in PROFILE_HOT_PATHS)
+    ]
+    hot_paths.sort(key=lambda entry: entry["cumulative_time"], reverse=True)
+    return hot_paths[:PROFILE_TOP]
@@ -0,0 +1,180 @@
+"""Daily scheduling helpers for the MinderGas integration."""
+import logging
+from datetime import datetime, time, timedelta
+from random import Random
+from statistics import median
+from typing import Awaitable, Callable, Optional
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ADAPTIVE_REFRESH_LATEST,
+    ADAPTIVE_REFRESH_MARGIN,
+    ADAPTIVE_REFRESH_MIN_SAMPLES,
+    DEFAULT_POST_TIME,
+    DEFAULT_UPDATE_TIME,
+    POST_METER_WINDOW_END,
+    POST_METER_WINDOW_START,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_time(value) -> time:
+    """Parse a HH:MM or HH:MM:SS string (or pass through a time)."""
+    if isinstance(value, time):
+        return value
+    return time.fromisoformat(value)
+
+
+def _seconds(value: time) -> int:
+    """Return the number of seconds since midnight of a time."""
+    return value.hour * 3600 + value.minute * 60 + value.second
+
+
+def _from_seconds(seconds: int) -> time:
+    """Return the time of day for a number of seconds since midnight."""
+    return time(seconds // 3600, seconds % 3600 // 60, seconds % 60)
+
+
+def pick_post_time(post_time: Optional[str], randomize: bool, rng: Random) -> time:
+    """
+    Pick the time of day for a meter reading post.
+
+    With randomize enabled any second within the posting window can be
+    picked. A fixed time is clamped into the window and spread over the
+    minute starting at it (or ending at the window end), so installations
+    sharing a time don't all post at the exact same second.
+
+    Args:
+        post_time: Configured post time (HH:MM), used when not randomizing
+        randomize: Whether to pick a random time within the window
+        rng: Random number generator to use
+
+    Returns:
+        The time of day to post at
+    """
+    start = _seconds(parse_time(POST_METER_WINDOW_START))
+    end = _seconds(parse_time(POST_METER_WINDOW_END))
+
+    if randomize:
+        return _from_seconds(rng.randint(start, end))
+
+    # A time at the end of the window is spread over the minute before it
+    chosen = _seconds(parse_time(post_time or DEFAULT_POST_TIME))
+    chosen = min(max(chosen, start), end - 59)
+    return _from_seconds(chosen + rng.randint(0, 59))
+
+
+def pick_refresh_time(update_time: Optional[str], change_minutes: list[int]) -> time:
+    """
+    Pick the time of day for the stats refresh.
+
+    Once enough changes have been observed, the refresh moves to shortly
+    after the median minute of the day at which MinderGas published new
+    data, bounded to after the posting window. Until then the configured
+    update time is used.
+
+    Args:
+        update_time: Configured update time (HH:MM)
+        change_minutes: Observed minutes of the day at which data changed
+
+    Returns:
+        The time of day to refresh at
+    """
+    if len(change_minutes) < ADAPTIVE_REFRESH_MIN_SAMPLES:
+        return parse_time(update_time or DEFAULT_UPDATE_TIME)
+
+    earliest = _seconds(parse_time(POST_METER_WINDOW_END))
+    latest = _seconds(parse_time(ADAPTIVE_REFRESH_LATEST))
+    target = int(median(change_minutes) * 60 + ADAPTIVE_REFRESH_MARGIN.total_seconds())
+    return _from_seconds(min(max(target, earliest), latest))
+
+
+def next_occurrence(
+    now: datetime, at: time, last_run: Optional[datetime] = None
+) -> datetime:
+    """
+    Return the first moment after now at the given local time of day.
+
+    When the job already ran today (last_run), the time picked anew after
+    that run may still lie ahead today; the next run then moves to the
+    following day, so the job runs at most once per day.
+    """
+    candidate = now.replace(
+        hour=at.hour, minute=at.minute, second=at.second, microsecond=0
+    )
+    if candidate <= now:
+        # Aware datetime arithmetic keeps the wall clock time across DST
+        candidate += timedelta(days=1)
+    if last_run is not None and candidate.date() <= last_run.date():
+        candidate += timedelta(days=1)
+    return candidate
+
+
+class DailyJob:
+    """
+    Run a job once a day at a time picked anew for every day.
+
+    The time of day comes from a picker called after each run, which allows
+    a fresh random time within the posting window every day.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        name: str,
+        pick_time: Callable[[], time],
+        job: Callable[[], Awaitable[None]],
+    ):
+        """Initialize the job."""
+        self.hass = hass
+        self.name = name
+        self._pick_time = pick_time
+        self._job = job
+        self._unsub: Optional[CALLBACK_TYPE] = None
+        self._stopped = False
+        self.next_run: Optional[datetime] = None
+        self.last_run: Optional[datetime] = None
+
+    @callback
+    def async_start(self) -> CALLBACK_TYPE:
+        """Schedule the first run and return a callback to stop the job."""
+        self._schedule_next()
+        return self.async_stop
+
+    @callback
+    def async_stop(self) -> None:
+        """Cancel the scheduled run."""
+        self._stopped = True
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def _schedule_next(self) -> None:
+        """Schedule the next run."""
+        if self._stopped:
+            return
+        self.next_run = next_occurrence(
+            dt_util.now(), self._pick_time(), self.last_run
+        )
+        _LOGGER.debug("Next %s scheduled at %s", self.name, self.next_run)
+        self._unsub = async_track_point_in_time(
+            self.hass, self._async_run, self.next_run
+        )
+
+    async def _async_run(self, now: datetime) -> None:
+        """Run the job and schedule the next day's run."""
+        self._unsub = None
+        self.last_run = self.next_run
+        try:
+            await self._job()
+        except Exception as err:
+            _LOGGER.error(
+                "Error running scheduled %s: %s", self.name, err, exc_info=True
+            )
+        finally:
+            self._schedule_next()
@@ -1,22 +1,26 @@
 """Sensors for MinderGas integration."""
 import logging
-from datetime import date
+from datetime import date, timedelta
 from typing import Any, Callable, Optional
 
 from homeassistant.components.sensor import (
-    SensorEntity,
-    SensorStateClass,
+    RestoreSensor,
     SensorDeviceClass,
+    SensorExtraStoredData,
+    SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfEnergy, UnitOfVolume
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_point_in_time
 from homeassistant.helpers.typing import StateType
+from homeassistant.util import dt as dt_util
 
 from .api import MinderGasAPI
-from .const import DOMAIN, CONF_UPDATE_STATS
+from .const import DOMAIN, CONF_UPDATE_STATS, SIGNAL_STATS_UPDATED, STALE_AFTER
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -62,8 +66,21 @@ async def async_setup_entry(
     async_add_entities(entities)
 
 
-class MinderGasBaseSensor(SensorEntity):
-    """Base class for MinderGas sensors."""
+class MinderGasBaseSensor(RestoreSensor):
+    """
+    Base class for MinderGas sensors.
+
+    Subclasses implement _live_value (and _live_unit) on top of the data
+    fetched from MinderGas. Until data has been fetched, the value and unit
+    restored from before the last restart are served instead.
+
+    The state is computed once per stats update and kept in the _attr_*
+    fields, as Home Assistant reads the value, unit and attributes several
+    times for every state write.
+    """
+
+    # Snapshot history field used for change attributes, if any
+    _history_field: Optional[str] = None
 
     def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry):
         """Initialize the sensor."""
@@ -72,6 +89,8 @@ class MinderGasBaseSensor(SensorEntity):
         self._attr_attribution = "Data provided by MinderGas"
         self._attr_should_poll = False
         self._unsub_update = None
+        self._unsub_stale: Optional[Callable[[], None]] = None
+        self._restored: Optional[SensorExtraStoredData] = None
         # Use domain and unique_id for entity_id
         self._attr_has_entity_name = True
         self._attr_device_info = {
@@ -91,34 +110,104 @@ class MinderGasBaseSensor(SensorEntity):
         except (KeyError, TypeError):
             return {}
 
+    def _live_value(self) -> StateType | date:
+        """Return the sensor value from the latest fetched data."""
+        return None
+
+    def _live_unit(self) -> Optional[str]:
+        """Return the unit of measurement from the latest fetched data."""
+        return None
+
+    def _state_attributes(self, data: dict[str, Any]) -> dict[str, Any]:
+        """Return data freshness and day-over-day change attributes."""
+        last_fetched = data.get("last_fetched")
+        attributes: dict[str, Any] = {
+            "last_fetched": last_fetched.isoformat() if last_fetched else None,
+            "stale": last_fetched is None
+            or dt_util.utcnow() - last_fetched > STALE_AFTER,
+        }
+
+        history = data.get("history")
+        if self._history_field is not None and history is not None:
+            attributes.update(history.trend_attributes(self._history_field))
+        return attributes
+
+    @callback
+    def _async_update_state(self) -> None:
+        """Compute the state once from the latest or restored data."""
+        value = self._live_value()
+        unit = self._live_unit()
+        if self._restored is not None:
+            if value is None:
+                value = self._restored.native_value
+            if unit is None:
+                unit = self._restored.native_unit_of_measurement
+        self._attr_native_value = value
+        self._attr_native_unit_of_measurement = unit
+        self._async_update_attributes()
+
+    @callback
+    def _async_update_attributes(self) -> None:
+        """Compute the attributes and schedule the write marking them stale."""
+        data = self._get_data()
+        self._attr_extra_state_attributes = self._state_attributes(data)
+
+        if self._unsub_stale is not None:
+            self._unsub_stale()
+            self._unsub_stale = None
+        last_fetched = data.get("last_fetched")
+        if last_fetched is None or self._attr_extra_state_attributes["stale"]:
+            return
+
+        @callback
+        def mark_stale(_now) -> None:
+            """Write the state once the data has become stale."""
+            self._unsub_stale = None
+            self._async_update_attributes()
+            self.async_write_ha_state()
+
+        # Just past the threshold, as stale means older than STALE_AFTER
+        self._unsub_stale = async_track_point_in_time(
+            self.hass, mark_stale, last_fetched + STALE_AFTER + timedelta(seconds=1)
+        )
+
     async def async_added_to_hass(self) -> None:
-        """Subscribe to updates."""
+        """Restore the last known value and subscribe to updates."""
         await super().async_added_to_hass()
+        self._restored = await self.async_get_last_sensor_data()
         
-        # Subscribe to stats update events
+        # Subscribe to stats updates of this entry
         @callback
-        def handle_stats_update(event):
-            """Handle stats update event."""
-            if event.data.get("entry_id") == self.config_entry.entry_id:
+        def handle_stats_update(changed: bool) -> None:
+            """Handle stats update signal, which may only move the fetch time."""
+            if changed:
+                self._async_update_state()
+                self.async_write_ha_state()
+                return
+            
+            # Unchanged stats only move the fetch time: skip the state write
+            # unless the sensor stops being stale
+            was_stale = (self._attr_extra_state_attributes or {}).get("stale")
+            self._async_update_attributes()
+            if was_stale and not self._attr_extra_state_attributes["stale"]:
                 self.async_write_ha_state()
         
-        self._unsub_update = self.hass.bus.async_listen(
-            f"{DOMAIN}_stats_updated",
+        self._unsub_update = async_dispatcher_connect(
+            self.hass,
+            SIGNAL_STATS_UPDATED.format(self.config_entry.entry_id),
             handle_stats_update,
         )
         
-        # Trigger initial update
-        await self._async_update()
+        # Compute the initial state
+        self._async_update_state()
 
     async def async_will_remove_from_hass(self) -> None:
         """Unsubscribe from updates."""
         await super().async_will_remove_from_hass()
         if self._unsub_update:
             self._unsub_update()
-
-    async def _async_update(self) -> None:
-        """Update sensor state."""
-        pass
+        if self._unsub_stale:
+            self._unsub_stale()
 
 
 class MinderGasYearlyUsagePeriodStartSensor(MinderGasBaseSensor):
@@ -129,9 +218,8 @@ class MinderGasYearlyUsagePeriodStartSensor(MinderGasBaseSensor):
     _attr_icon = "mdi:calendar-start"
     _attr_device_class = SensorDeviceClass.DATE
 
-    @property
-    def native_value(self) -> Optional[date]:
-        """Return the sensor value."""
+    def _live_value(self) -> Optional[date]:
+        """Return the sensor value from the latest fetched data."""
         data = self._get_data()
         yearly_usage = data.get("yearly_usage")
         
@@ -151,9 +239,8 @@ class MinderGasYearlyUsagePeriodEndSensor(MinderGasBaseSensor):
     _attr_icon = "mdi:calendar-end"
     _attr_device_class = SensorDeviceClass.DATE
 
-    @property
-    def native_value(self) -> Optional[date]:
-        """Return the sensor value."""
+    def _live_value(self) -> Optional[date]:
+        """Return the sensor value from the latest fetched data."""
         data = self._get_data()
         yearly_usage = data.get("yearly_usage")
         
@@ -173,9 +260,8 @@ class MinderGasYearlyForecastPeriodStartSensor(MinderGasBaseSensor):
     _attr_icon = "mdi:calendar-start"
     _attr_device_class = SensorDeviceClass.DATE
 
-    @property
-    def native_value(self) -> Optional[date]:
-        """Return the sensor value."""
+    def _live_value(self) -> Optional[date]:
+        """Return the sensor value from the latest fetched data."""
         data = self._get_data()
         forecast = data.get("forecast")
         
@@ -195,9 +281,8 @@ class MinderGasYearlyForecastPeriodEndSensor(MinderGasBaseSensor):
     _attr_icon = "mdi:calendar-end"
     _attr_device_class = SensorDeviceClass.DATE
 
-    @property
-    def native_value(self) -> Optional[date]:
-        """Return the sensor value."""
+    def _live_value(self) -> Optional[date]:
+        """Return the sensor value from the latest fetched data."""
         data = self._get_data()
         forecast = data.get("forecast")
         
@@ -217,10 +302,10 @@ class MinderGasYearlyHeatingUsageSensor(MinderGasBaseSensor):
     _attr_icon = "mdi:fire"
     _attr_state_class = SensorStateClass.TOTAL_INCREASING
     _attr_device_class = SensorDeviceClass.VOLUME
+    _history_field = "usage_heating"
 
-    @property
-    def native_value(self) -> Optional[float]:
-        """Return the sensor value."""
+    def _live_value(self) -> Optional[float]:
+        """Return the sensor value from the latest fetched data."""
         data = self._get_data()
         yearly_usage = data.get("yearly_usage")
         
@@ -229,9 +314,8 @@ class MinderGasYearlyHeatingUsageSensor(MinderGasBaseSensor):
         
         return None
 
-    @property
-    def native_unit_of_measurement(self) -> Optional[str]:
-        """Return the unit of measurement."""
+    def _live_unit(self) -> Optional[str]:
+        """Return the unit of measurement from the latest fetched data."""
         data = self._get_data()
         yearly_usage = data.get("yearly_usage")
         
@@ -250,10 +334,10 @@ class MinderGasYearlyTotalUsageSensor(MinderGasBaseSensor):
     _attr_icon = "mdi:meter-gas"
     _attr_state_class = SensorStateClass.TOTAL_INCREASING
     _attr_device_class = SensorDeviceClass.VOLUME
+    _history_field = "usage_total"
 
-    @property
-    def native_value(self) -> Optional[float]:
-        """Return the sensor value."""
+    def _live_value(self) -> Optional[float]:
+        """Return the sensor value from the latest fetched data."""
         data = self._get_data()
         yearly_usage = data.get("yearly_usage")
         
@@ -262,9 +346,8 @@ class MinderGasYearlyTotalUsageSensor(MinderGasBaseSensor):
         
         return None
 
-    @property
-    def native_unit_of_measurement(self) -> Optional[str]:
-        """Return the unit of measurement."""
+    def _live_unit(self) -> Optional[str]:
+        """Return the unit of measurement from the latest fetched data."""
         data = self._get_data()
         yearly_usage = data.get("yearly_usage")
         
@@ -282,10 +365,10 @@ class MinderGasYearlyHeatingForecastSensor(MinderGasBaseSensor):
     _attr_name = "Yearly Heating Forecast"
     _attr_icon = "mdi:fire"
     _attr_state_class = SensorStateClass.MEASUREMENT
+    _history_field = "forecast_heating"
 
-    @property
-    def native_value(self) -> Optional[float]:
-        """Return the sensor value."""
+    def _live_value(self) -> Optional[float]:
+        """Return the sensor value from the latest fetched data."""
         data = self._get_data()
         forecast = data.get("forecast")
         
@@ -294,9 +377,8 @@ class MinderGasYearlyHeatingForecastSensor(MinderGasBaseSensor):
         
         return None
 
-    @property
-    def native_unit_of_measurement(self) -> Optional[str]:
-        """Return the unit of measurement."""
+    def _live_unit(self) -> Optional[str]:
+        """Return the unit of measurement from the latest fetched data."""
         data = self._get_data()
         forecast = data.get("forecast")
         
@@ -314,10 +396,10 @@ class MinderGasYearlyTotalForecastSensor(MinderGasBaseSensor):
     _attr_name = "Yearly Total Forecast"
     _attr_icon = "mdi:meter-gas"
     _attr_state_class = SensorStateClass.MEASUREMENT
+    _history_field = "forecast_total"
 
-    @property
-    def native_value(self) -> Optional[float]:
-        """Return the sensor value."""
+    def _live_value(self) -> Optional[float]:
+        """Return the sensor value from the latest fetched data."""
         data = self._get_data()
         forecast = data.get("forecast")
         
@@ -326,9 +408,8 @@ class MinderGasYearlyTotalForecastSensor(MinderGasBaseSensor):
         
         return None
 
-    @property
-    def native_unit_of_measurement(self) -> Optional[str]:
-        """Return the unit of measurement."""
+    def _live_unit(self) -> Optional[str]:
+        """Return the unit of measurement from the latest fetched data."""
         data = self._get_data()
         forecast = data.get("forecast")
         
@@ -346,10 +427,10 @@ class MinderGasUsagePerDegreeDaySensor(MinderGasBaseSensor):
     _attr_name = "Usage Per Degree Day"
     _attr_icon = "mdi:thermometer-lines"
     _attr_state_class = SensorStateClass.MEASUREMENT
+    _history_field = "degree_day"
 
-    @property
-    def native_value(self) -> Optional[float]:
-        """Return the sensor value."""
+    def _live_value(self) -> Optional[float]:
+        """Return the sensor value from the latest fetched data."""
         data = self._get_data()
         degree_day = data.get("degree_day")
         
@@ -358,9 +439,8 @@ class MinderGasUsagePerDegreeDaySensor(MinderGasBaseSensor):
         
         return None
 
-    @property
-    def native_unit_of_measurement(self) -> Optional[str]:
-        """Return the unit of measurement."""
+    def _live_unit(self) -> Optional[str]:
+        """Return the unit of measurement from the latest fetched data."""
         data = self._get_data()
         degree_day = data.get("degree_day")
         
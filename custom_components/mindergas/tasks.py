@@ -0,0 +1,199 @@
+"""Background task supervision for the MinderGas integration."""
+import asyncio
+import logging
+from time import monotonic
+from typing import Any, Coroutine, Optional
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    OUTBOX_STORAGE_VERSION,
+    TASK_MAX_CONCURRENCY,
+    TASK_MAX_LONG_RUNNING,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class TaskSupervisor:
+    """
+    Own the background jobs of a config entry.
+
+    Jobs (refreshes, posts, imports) run with bounded concurrency and are
+    tracked so they can be drained on unload or shutdown. Long-running jobs
+    such as imports have their own limit, so they never hold up refreshes
+    and posts. Run counts and
+    durations per job name are kept for diagnostics.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        max_concurrency: int = TASK_MAX_CONCURRENCY,
+        max_long_running: int = TASK_MAX_LONG_RUNNING,
+    ):
+        """Initialize the supervisor."""
+        self.hass = hass
+        self.entry = entry
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._long_running_semaphore = asyncio.Semaphore(max_long_running)
+        self._running: dict[asyncio.Task, str] = {}
+        self._closing = False
+        self.stats: dict[str, dict[str, Any]] = {}
+
+    @callback
+    def async_spawn(
+        self, name: str, coro: Coroutine, long_running: bool = False
+    ) -> Optional[asyncio.Task]:
+        """
+        Start a job in the background.
+
+        Args:
+            name: Job name, used for the task name and statistics
+            coro: Coroutine running the job
+            long_running: Whether the job runs for a long time, like an
+                import, and takes a slot of its own limit
+
+        Returns:
+            The task running the job, or None when the supervisor is draining
+        """
+        if self._closing:
+            _LOGGER.debug("Not starting %s, supervisor is draining", name)
+            coro.close()
+            return None
+
+        task = self.entry.async_create_background_task(
+            self.hass,
+            self._async_run(
+                name,
+                coro,
+                self._long_running_semaphore if long_running else self._semaphore,
+            ),
+            f"{DOMAIN}_{name}",
+        )
+        self._running[task] = name
+        task.add_done_callback(self._running.pop)
+        return task
+
+    async def async_run(self, name: str, coro: Coroutine) -> Any:
+        """Run a job under supervision and wait for its result."""
+        if (task := self.async_spawn(name, coro)) is None:
+            return None
+        return await task
+
+    async def _async_run(
+        self, name: str, coro: Coroutine, semaphore: asyncio.Semaphore
+    ) -> Any:
+        """Run a job once a concurrency slot is free, recording its stats."""
+        stats = self.stats.setdefault(
+            name,
+            {
+                "runs": 0,
+                "failures": 0,
+                "cancelled": 0,
+                "last_duration": None,
+                "total_duration": 0.0,
+            },
+        )
+        async with semaphore:
+            start = monotonic()
+            try:
+                return await coro
+            except asyncio.CancelledError:
+                stats["cancelled"] += 1
+                raise
+            except Exception:
+                stats["failures"] += 1
+                raise
+            finally:
+                duration = round(monotonic() - start, 3)
+                stats["runs"] += 1
+                stats["last_duration"] = duration
+                stats["total_duration"] = round(stats["total_duration"] + duration, 3)
+
+    async def async_drain(self, timeout: float) -> list[str]:
+        """
+        Stop accepting jobs and wait for the running ones to finish.
+
+        Jobs still running after the timeout are cancelled, which gives them
+        the chance to persist their unfinished work.
+
+        Returns:
+            Names of the jobs that had to be cancelled
+        """
+        self._closing = True
+        if not self._running:
+            return []
+
+        _LOGGER.debug("Draining %s running jobs", len(self._running))
+        _, pending = await asyncio.wait(list(self._running), timeout=timeout)
+        cancelled = [self._running[task] for task in pending if task in self._running]
+        for task in pending:
+            task.cancel()
+        if pending:
+            _LOGGER.warning(
+                "Cancelled jobs still running after %ss: %s",
+                timeout,
+                ", ".join(cancelled),
+            )
+            await asyncio.wait(pending)
+        return cancelled
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return running jobs and per-job statistics."""
+        return {
+            "running": sorted(self._running.values()),
+            "draining": self._closing,
+            "jobs": self.stats,
+        }
+
+
+class Outbox:
+    """Persisted queue of meter readings that still have to be posted."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        """Initialize the outbox."""
+        self._store: Store = Store(
+            hass, OUTBOX_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.outbox"
+        )
+        self._pending: dict[str, float] = {}
+
+    def __len__(self) -> int:
+        """Return the number of pending readings."""
+        return len(self._pending)
+
+    def __contains__(self, date: object) -> bool:
+        """Return whether a reading for a date is pending."""
+        return date in self._pending
+
+    async def async_load(self) -> None:
+        """Load the pending readings."""
+        self._pending = await self._store.async_load() or {}
+
+    async def async_save(self) -> None:
+        """Persist the pending readings."""
+        await self._store.async_save(self._pending)
+
+    async def async_remove(self) -> None:
+        """Remove the persisted outbox."""
+        await self._store.async_remove()
+
+    @callback
+    def add(self, date: str, reading: float) -> None:
+        """Queue a reading to be posted later."""
+        self._pending[date] = reading
+        self._store.async_delay_save(lambda: self._pending)
+
+    @callback
+    def discard(self, date: str) -> None:
+        """Forget a reading that has been posted."""
+        if self._pending.pop(date, None) is not None:
+            self._store.async_delay_save(lambda: self._pending)
+
+    def items(self) -> list[tuple[str, float]]:
+        """Return the pending readings, oldest first."""
+        return sorted(self._pending.items())
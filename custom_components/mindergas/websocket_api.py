@@ -0,0 +1,121 @@
+"""Websocket API for the MinderGas integration."""
+import logging
+from typing import Any, Optional
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+ATTR_ENTRY_ID = "entry_id"
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the MinderGas websocket commands."""
+    websocket_api.async_register_command(hass, ws_snapshot)
+    websocket_api.async_register_command(hass, ws_subscribe_snapshot)
+
+
+def _entry_ids(hass: HomeAssistant, entry_id: Optional[str]) -> list[str]:
+    """Return the loaded entry IDs matching an optional entry ID."""
+    loaded = list(hass.data.get(DOMAIN, {}))
+    if entry_id is None:
+        return loaded
+    return [entry_id] if entry_id in loaded else []
+
+
+def entry_snapshot(hass: HomeAssistant, entry_id: str) -> dict[str, Any]:
+    """Return the decoded stats and fetch metadata of an entry."""
+    data = hass.data[DOMAIN][entry_id]
+    last_fetched = data.get("last_fetched")
+    history = data.get("history")
+    return {
+        "entry_id": entry_id,
+        "yearly_usage": data.get("yearly_usage"),
+        "forecast": data.get("forecast"),
+        "degree_day": data.get("degree_day"),
+        "last_fetched": last_fetched.isoformat() if last_fetched else None,
+        "incomplete": data.get("incomplete", []),
+        "content_hash": history.content_hash if history is not None else None,
+    }
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "mindergas/snapshot",
+        vol.Optional(ATTR_ENTRY_ID): str,
+    }
+)
+@callback
+def ws_snapshot(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """Return the current snapshot of one or all config entries."""
+    entry_ids = _entry_ids(hass, msg.get(ATTR_ENTRY_ID))
+    if ATTR_ENTRY_ID in msg and not entry_ids:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not loaded"
+        )
+        return
+
+    connection.send_result(
+        msg["id"],
+        {"snapshots": [entry_snapshot(hass, entry_id) for entry_id in entry_ids]},
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "mindergas/subscribe_snapshot",
+        vol.Optional(ATTR_ENTRY_ID): str,
+    }
+)
+@callback
+def ws_subscribe_snapshot(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict
+) -> None:
+    """
+    Subscribe to snapshot changes of one or all config entries.
+
+    The current snapshots are sent right away. After that a snapshot is
+    pushed only when a refresh fetched data that differs from before.
+    """
+    entry_id = msg.get(ATTR_ENTRY_ID)
+    if entry_id is not None and not _entry_ids(hass, entry_id):
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not loaded"
+        )
+        return
+
+    @callback
+    def forward_snapshot(event: Event) -> None:
+        """Push the snapshot of the entry that changed."""
+        changed = event.data.get(ATTR_ENTRY_ID)
+        if entry_id is not None and changed != entry_id:
+            return
+        if changed not in hass.data.get(DOMAIN, {}):
+            return
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"], {"snapshots": [entry_snapshot(hass, changed)]}
+            )
+        )
+
+    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+        f"{DOMAIN}_stats_updated", forward_snapshot
+    )
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"],
+            {
+                "snapshots": [
+                    entry_snapshot(hass, loaded) for loaded in _entry_ids(hass, entry_id)
+                ]
+            },
+        )
+    )
@@ -0,0 +1,115 @@
+"""Virtual-clock load test of the daily meter reading post schedule."""
+from collections import Counter
+from datetime import datetime, timedelta
+from random import Random
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.mindergas.const import (
+    POST_METER_WINDOW_END,
+    POST_METER_WINDOW_START,
+)
+from custom_components.mindergas.schedule import (
+    next_occurrence,
+    parse_time,
+    pick_post_time,
+)
+
+INSTALLATIONS = 10_000
+DAYS = 7
+WINDOW_START = parse_time(POST_METER_WINDOW_START)
+WINDOW_END = parse_time(POST_METER_WINDOW_END)
+# Starts before the switch to daylight saving time on 29 March
+START = datetime(2026, 3, 25, 12, 0, tzinfo=dt_util.get_time_zone("Europe/Amsterdam"))
+
+# Peak posts within a single second across the whole fleet: on average
+# about 3 for randomized times (spread over the window) and about 167 for
+# a shared fixed time (spread over one minute)
+MAX_PEAK_RANDOMIZED = 15
+MAX_PEAK_FIXED = 250
+
+
+def simulate(post_time: str, randomize: bool) -> list[datetime]:
+    """
+    Return every post moment of a fleet of installations over DAYS days.
+
+    Each installation runs the same loop as DailyJob: pick a time of day,
+    advance the virtual clock to its next occurrence, post and repeat.
+    Installations are started at different moments and use their own RNG.
+    """
+    posts = []
+    for installation in range(INSTALLATIONS):
+        rng = Random(installation)
+        now = START + timedelta(seconds=installation % 3600)
+        last_run = None
+        for _ in range(DAYS):
+            at = pick_post_time(post_time, randomize, rng)
+            now = last_run = next_occurrence(now, at, last_run)
+            posts.append(now)
+    return posts
+
+
+def peak_per_second(posts: list[datetime]) -> int:
+    """Return the highest number of posts within the same second."""
+    return max(Counter(int(post.timestamp()) for post in posts).values())
+
+
+@pytest.mark.parametrize(
+    ("post_time", "randomize", "max_peak"),
+    [
+        ("00:30", True, MAX_PEAK_RANDOMIZED),
+        ("00:30", False, MAX_PEAK_FIXED),
+        ("00:05", False, MAX_PEAK_FIXED),
+        ("01:00", False, MAX_PEAK_FIXED),
+    ],
+)
+def test_posts_stay_in_window_and_spread(
+    post_time: str, randomize: bool, max_peak: int
+) -> None:
+    """Test every post is in the window, once a day, below the peak rate."""
+    posts = simulate(post_time, randomize)
+
+    assert len(posts) == INSTALLATIONS * DAYS
+    for post in posts:
+        assert WINDOW_START <= post.time() <= WINDOW_END
+
+    # Exactly one post per installation per local day, also across DST
+    days = Counter(post.date() for post in posts)
+    assert len(days) == DAYS
+    assert set(days.values()) == {INSTALLATIONS}
+
+    assert peak_per_second(posts) <= max_peak
+
+
+def test_randomized_posts_are_spread_evenly() -> None:
+    """Test randomized posts fill every minute of the window evenly."""
+    posts = simulate("00:30", True)
+
+    # The window ends at its first second of the last minute, so only the
+    # minutes before it are full
+    per_minute = Counter(
+        (post.date(), post.hour * 60 + post.minute)
+        for post in posts
+        if post.time() < WINDOW_END
+    )
+    full_minutes = (
+        WINDOW_END.hour * 60 + WINDOW_END.minute
+        - WINDOW_START.hour * 60
+        - WINDOW_START.minute
+    )
+    window_seconds = full_minutes * 60 + 1
+    expected = INSTALLATIONS * 60 / window_seconds
+
+    assert len(per_minute) == full_minutes * DAYS
+    for count in per_minute.values():
+        assert 0.7 * expected <= count <= 1.3 * expected
+
+
+def test_fixed_time_outside_window_is_clamped() -> None:
+    """Test a configured time outside the window is moved into it."""
+    rng = Random(0)
+    for post_time in ("00:00", "02:00", "23:59"):
+        for _ in range(100):
+            picked = pick_post_time(post_time, False, rng)
+            assert WINDOW_START <= picked <= WINDOW_END
@@ -0,0 +1,219 @@
+"""Benchmarks and memory budgets of the sensor state-write path."""
+import gc
+import logging
+import tracemalloc
+from datetime import timedelta
+from time import perf_counter
+
+import pytest
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.entity_component import EntityComponent
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.mindergas.const import (
+    CONF_API_KEY,
+    CONF_UPDATE_STATS,
+    DOMAIN,
+    SIGNAL_STATS_UPDATED,
+)
+from custom_components.mindergas.history import SnapshotHistory
+from custom_components.mindergas.sensor import async_setup_entry
+
+_LOGGER = logging.getLogger(__name__)
+
+ENTRY_COUNTS = (1, 10, 100)
+SENSORS_PER_ENTRY = 9
+ROUNDS = 20
+
+# Regression thresholds
+MAX_SECONDS_PER_SENSOR_UPDATE = 0.001
+# Per-sensor update cost with 100 entries relative to a single entry
+MAX_SCALING_FACTOR = 3
+MAX_BLOCKS_PER_SENSOR_UPDATE = 250
+MAX_PEAK_BYTES_PER_SENSOR_UPDATE = 32 * 1024
+MAX_RETAINED_BYTES_PER_SENSOR_UPDATE = 512
+MAX_BYTES_PER_ENTRY = 256 * 1024
+
+# The history stores schedule delayed saves
+pytestmark = pytest.mark.parametrize("expected_lingering_timers", [True])
+
+
+def stats_payloads(scale: float = 1.0) -> dict[str, dict]:
+    """Return decoded stats as fetched from MinderGas."""
+    return {
+        "yearly_usage": {
+            "date_from": "2025-10-19",
+            "date_to": "2026-10-18",
+            "heating": {"value": round(812.4 * scale, 3), "unit": "cubic_meter"},
+            "total": {"value": round(1043.9 * scale, 3), "unit": "cubic_meter"},
+        },
+        "forecast": {
+            "date_from": "2026-10-19",
+            "date_to": "2027-10-18",
+            "heating": {"value": round(798.0 * scale, 3), "unit": "cubic_meter"},
+            "total": {"value": round(1021.5 * scale, 3), "unit": "cubic_meter"},
+        },
+        "degree_day": {
+            "avg_last_365_days": {
+                "value": round(0.31 * scale, 3),
+                "unit": "cubic_meter",
+            }
+        },
+    }
+
+
+@pytest.fixture
+async def add_entries(hass: HomeAssistant):
+    """Return a helper adding config entries with their sensors."""
+    component = EntityComponent(_LOGGER, "sensor", hass)
+    entities = []
+    added = 0
+
+    async def _add(count: int) -> list[str]:
+        """Add config entries with fetched stats and 30 days of history."""
+        nonlocal added
+        entry_ids = []
+        today = dt_util.now().date()
+        for index in range(added, added + count):
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                data={CONF_API_KEY: f"key-{index}", CONF_UPDATE_STATS: True},
+            )
+            history = SnapshotHistory(hass, entry.entry_id)
+            for days_ago in range(30, -1, -1):
+                payloads = stats_payloads(1 - days_ago / 1000)
+                history.record(
+                    today - timedelta(days=days_ago),
+                    payloads["yearly_usage"],
+                    payloads["forecast"],
+                    payloads["degree_day"],
+                )
+            hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
+                **stats_payloads(),
+                "last_fetched": dt_util.utcnow(),
+                "incomplete": [],
+                "history": history,
+            }
+
+            new_entities = []
+            await async_setup_entry(hass, entry, new_entities.extend)
+            for entity in new_entities:
+                entity._attr_unique_id = f"{entry.entry_id}_{entity.unique_id}"
+            await component.async_add_entities(new_entities)
+            entities.extend(new_entities)
+            entry_ids.append(entry.entry_id)
+        added += count
+        await hass.async_block_till_done()
+        return entry_ids
+
+    yield _add
+
+    for entity in entities:
+        await entity.async_remove()
+    await hass.async_block_till_done()
+
+
+def fan_out(hass: HomeAssistant, entry_ids: list[str]) -> None:
+    """Notify the sensors of every entry of changed stats."""
+    for entry_id in entry_ids:
+        async_dispatcher_send(hass, SIGNAL_STATS_UPDATED.format(entry_id), True)
+
+
+def best_fan_out_time(hass: HomeAssistant, entry_ids: list[str]) -> float:
+    """Return the fastest of several fan-out rounds, in seconds."""
+    timings = []
+    for _ in range(ROUNDS):
+        start = perf_counter()
+        fan_out(hass, entry_ids)
+        timings.append(perf_counter() - start)
+    return min(timings)
+
+
+@pytest.mark.parametrize("entries", ENTRY_COUNTS)
+async def test_fan_out_time(
+    hass: HomeAssistant, add_entries, benchmark, entries: int
+) -> None:
+    """Benchmark a stats update fan-out, including the state writes."""
+    entry_ids = await add_entries(entries)
+
+    benchmark.pedantic(fan_out, args=(hass, entry_ids), rounds=ROUNDS, iterations=1)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.yearly_total_forecast")
+    assert state is not None
+    assert float(state.state) == 1021.5
+    if benchmark.stats is not None:
+        per_sensor = benchmark.stats.stats.mean / (entries * SENSORS_PER_ENTRY)
+        assert per_sensor < MAX_SECONDS_PER_SENSOR_UPDATE
+
+
+async def test_fan_out_scales_linearly(hass: HomeAssistant, add_entries) -> None:
+    """Test the per-sensor update cost doesn't grow with the entry count."""
+    entry_ids = await add_entries(1)
+    single = best_fan_out_time(hass, entry_ids) / SENSORS_PER_ENTRY
+    await hass.async_block_till_done()
+
+    entry_ids += await add_entries(ENTRY_COUNTS[-1] - 1)
+    fleet = best_fan_out_time(hass, entry_ids) / (len(entry_ids) * SENSORS_PER_ENTRY)
+    await hass.async_block_till_done()
+
+    assert fleet <= single * MAX_SCALING_FACTOR
+
+
+@pytest.mark.parametrize("entries", ENTRY_COUNTS)
+async def test_allocations_per_update(
+    hass: HomeAssistant, add_entries, entries: int
+) -> None:
+    """Test the allocations of a fan-out and what stays allocated after it."""
+    entry_ids = await add_entries(entries)
+    sensors = entries * SENSORS_PER_ENTRY
+    # Warm up caches, so only the steady state is measured
+    fan_out(hass, entry_ids)
+    await hass.async_block_till_done()
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        baseline = tracemalloc.get_traced_memory()[0]
+        fan_out(hass, entry_ids)
+        peak = tracemalloc.get_traced_memory()[1]
+        after = tracemalloc.take_snapshot()
+        blocks = sum(
+            max(stat.count_diff, 0) for stat in after.compare_to(before, "filename")
+        )
+
+        await hass.async_block_till_done()
+        gc.collect()
+        settled = tracemalloc.get_traced_memory()[0]
+        for _ in range(ROUNDS):
+            fan_out(hass, entry_ids)
+            await hass.async_block_till_done()
+        gc.collect()
+        retained = tracemalloc.get_traced_memory()[0] - settled
+    finally:
+        tracemalloc.stop()
+
+    assert blocks / sensors <= MAX_BLOCKS_PER_SENSOR_UPDATE
+    assert (peak - baseline) / sensors <= MAX_PEAK_BYTES_PER_SENSOR_UPDATE
+    assert retained / (ROUNDS * sensors) <= MAX_RETAINED_BYTES_PER_SENSOR_UPDATE
+
+
+@pytest.mark.parametrize("entries", ENTRY_COUNTS)
+async def test_memory_per_entry(
+    hass: HomeAssistant, add_entries, entries: int
+) -> None:
+    """Test the memory held per config entry by its data and sensors."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        await add_entries(entries)
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    assert (after - before) / entries <= MAX_BYTES_PER_ENTRY